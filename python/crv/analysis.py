@@ -1,31 +1,38 @@
+from collections import Counter
 import numpy as np
+from python.crv.node import CRVNodeTable
+
+def _as_table(catalog) -> CRVNodeTable:
+    """Analysis runs on a CRVNodeTable; lists of CRVNode are converted once."""
+    return catalog if isinstance(catalog, CRVNodeTable) else CRVNodeTable.from_nodes(catalog)
 
 def realm_distribution(catalog):
     """
     Returns a count of nodes per realm.
     """
-    from collections import Counter
-    realms = [node.realm for node in catalog]
-    return Counter(realms)
+    table = _as_table(catalog)
+    counts = np.bincount(table.codes["realm"], minlength=len(table.categories["realm"]))
+    return Counter({realm: int(count) for realm, count in zip(table.categories["realm"], counts) if count})
 
 def known_vs_new_constants(catalog):
     """
     Returns the counts and lists of known vs new constants.
     """
-    known = [node for node in catalog if node.known_constant]
-    new = [node for node in catalog if not node.known_constant]
+    table = _as_table(catalog)
+    names = table.labels("crv_name")
+    known = table.known_constant
     return {
-        "known_count": len(known),
-        "new_count": len(new),
-        "known_constants": [node.crv_name for node in known],
-        "new_constants": [node.crv_name for node in new]
+        "known_count": int(np.count_nonzero(known)),
+        "new_count": int(len(table) - np.count_nonzero(known)),
+        "known_constants": names[known].tolist(),
+        "new_constants": names[~known].tolist()
     }
 
 def frequency_stats(catalog):
     """
     Returns min, max, mean frequency stats for catalog.
     """
-    freqs = np.array([node.frequency for node in catalog])
+    freqs = _as_table(catalog).frequency
     return {
         "min_frequency": float(np.min(freqs)),
         "max_frequency": float(np.max(freqs)),
@@ -36,9 +43,150 @@ def crv_statistics(catalog):
     """
     Returns min, max, mean CRV value stats.
     """
-    crvs = np.array([node.crv_value for node in catalog])
+    crvs = _as_table(catalog).crv_value
     return {
         "min_crv": float(np.min(crvs)),
         "max_crv": float(np.max(crvs)),
         "mean_crv": float(np.mean(crvs))
     }
+
+
+class RunningStats:
+    """
+    Count, sum, min and max of a numeric column, updated in O(1) per change.
+    Removing or replacing the current minimum or maximum marks it stale; it is
+    recomputed from `source()` (the live column) the next time it is read.
+    """
+    def __init__(self, source):
+        self.source = source
+        values = np.asarray(source(), dtype=float)
+        self.count = len(values)
+        self.total = float(np.sum(values))
+        self._min = float(np.min(values)) if self.count else None
+        self._max = float(np.max(values)) if self.count else None
+        self.refreshes = 0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=float).reshape(-1)
+        if not len(values):
+            return
+        was_empty = self.count == 0
+        self.count += len(values)
+        self.total += float(np.sum(values))
+        if was_empty:
+            self._min, self._max = float(np.min(values)), float(np.max(values))
+            return
+        # A stale extremum stays stale; the refresh will see the new values
+        if self._min is not None:
+            self._min = min(self._min, float(np.min(values)))
+        if self._max is not None:
+            self._max = max(self._max, float(np.max(values)))
+
+    def remove(self, value):
+        value = float(value)
+        self.count -= 1
+        self.total -= value
+        if value == self._min:
+            self._min = None
+        if value == self._max:
+            self._max = None
+
+    def replace(self, old, new):
+        """Replace a value, or arrays of old values by new ones."""
+        old = np.asarray(old, dtype=float).reshape(-1)
+        new = np.asarray(new, dtype=float).reshape(-1)
+        if not len(old):
+            return
+        self.total += float(np.sum(new - old))
+        if self._min is not None:
+            self._min = None if np.any((old == self._min) & (new > old)) else min(self._min, float(np.min(new)))
+        if self._max is not None:
+            self._max = None if np.any((old == self._max) & (new < old)) else max(self._max, float(np.max(new)))
+
+    def _refresh(self):
+        self.refreshes += 1
+        values = np.asarray(self.source(), dtype=float)
+        # Empty columns leave the extrema stale rather than NaN, so add() can set them
+        self._min = float(np.min(values)) if len(values) else None
+        self._max = float(np.max(values)) if len(values) else None
+
+    @property
+    def min(self):
+        if not self.count:
+            return np.nan
+        if self._min is None:
+            self._refresh()
+        return self._min
+
+    @property
+    def max(self):
+        if not self.count:
+            return np.nan
+        if self._max is None:
+            self._refresh()
+        return self._max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+
+class CatalogStats:
+    """
+    Aggregates of a catalog DataFrame kept up to date incrementally: node count,
+    realm counts, known/new constant counts, and frequency and CRV value
+    min/max/mean (see RunningStats). CRVCatalog feeds it every added, edited
+    and removed node.
+    """
+    def __init__(self, df_source):
+        self.df_source = df_source
+        df = df_source()
+        self.frequency = RunningStats(lambda: self.df_source()["Frequency_Hz"].to_numpy(dtype=float))
+        self.crv = RunningStats(lambda: self.df_source()["CRV_Value"].to_numpy(dtype=float))
+        self.realms = Counter(df["Realm"].tolist())
+        self.known = int(df["Is_Known_Constant"].to_numpy(dtype=bool).sum())
+
+    def add(self, rows):
+        self.frequency.add(rows["Frequency_Hz"].to_numpy(dtype=float))
+        self.crv.add(rows["CRV_Value"].to_numpy(dtype=float))
+        self.realms.update(rows["Realm"].tolist())
+        self.known += int(rows["Is_Known_Constant"].to_numpy(dtype=bool).sum())
+
+    def remove(self, record):
+        self.frequency.remove(record["Frequency_Hz"])
+        self.crv.remove(record["CRV_Value"])
+        self.remove_realm(record["Realm"])
+        self.known -= bool(record["Is_Known_Constant"])
+
+    def edit(self, column, old, new):
+        """Record an edited cell, or arrays of old and new values of one column."""
+        if column == "Frequency_Hz":
+            self.frequency.replace(old, new)
+        elif column == "CRV_Value":
+            self.crv.replace(old, new)
+        elif column == "Realm":
+            for realm in np.atleast_1d(np.asarray(old, dtype=object)).tolist():
+                self.remove_realm(realm)
+            self.realms.update(np.atleast_1d(np.asarray(new, dtype=object)).tolist())
+        elif column == "Is_Known_Constant":
+            self.known += int(np.sum(np.asarray(new, dtype=bool))) - int(np.sum(np.asarray(old, dtype=bool)))
+
+    def remove_realm(self, realm):
+        self.realms[realm] -= 1
+        if not self.realms[realm]:
+            del self.realms[realm]
+
+    def summary(self):
+        """The same figures as realm_distribution, frequency_stats and crv_statistics, plus counts."""
+        return {
+            "nodes": self.frequency.count,
+            "realm_distribution": Counter(self.realms),
+            "known_count": self.known,
+            "new_count": self.frequency.count - self.known,
+            "min_frequency": self.frequency.min,
+            "max_frequency": self.frequency.max,
+            "mean_frequency": self.frequency.mean,
+            "min_crv": self.crv.min,
+            "max_crv": self.crv.max,
+            "mean_crv": self.crv.mean,
+        }
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from python.crv.export import atomic_path
+
+# Sidecar directory next to the CSV: <csv_path>.cache/ holding one .npy per column and meta.json
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 1
+
+def cache_path(csv_path) -> str:
+    return str(csv_path) + CACHE_SUFFIX
+
+def file_digest(path, block_size=1 << 20) -> str:
+    """SHA-256 of a file, read a block at a time."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _source_stat(csv_path):
+    stat = os.stat(csv_path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("version") == CACHE_VERSION else None
+
+def _write_meta(cache_dir, meta):
+    # meta.json is written last and replaced atomically; it marks the column files as complete
+    with atomic_path(os.path.join(cache_dir, "meta.json")) as tmp, open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+
+def _column_arrays(series):
+    """
+    (kind, {suffix: array}) for a column, or None if it has no typed binary form.
+    Numeric columns are stored as is. String columns are dictionary-encoded as
+    int32 codes (-1 for missing) plus the sorted unique values, which keeps
+    them compact and fast to rebuild.
+    """
+    if series.dtype.kind in "biuf":
+        return "numeric", {"": series.to_numpy()}
+    values = series.to_numpy(dtype=object)
+    mask = pd.isna(series).to_numpy()
+    if not all(isinstance(v, str) for v in values[~mask]):
+        return None
+    uniques, inverse = np.unique(values[~mask].astype(str), return_inverse=True)
+    codes = np.full(len(values), -1, dtype=np.int32)
+    codes[~mask] = inverse
+    return "str", {".codes": codes, ".values": uniques}
+
+def write_cache(df: pd.DataFrame, csv_path, digest=None):
+    """
+    Write the columns of `df` as a binary sidecar cache for `csv_path`.
+    Returns the cache metadata, or None if a column has no typed binary form.
+    """
+    columns = [_column_arrays(df[name]) for name in df.columns]
+    if any(column is None for column in columns):
+        return None
+    cache_dir = cache_path(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    meta_columns = []
+    for i, (name, (kind, arrays)) in enumerate(zip(df.columns, columns)):
+        for suffix, array in arrays.items():
+            with atomic_path(os.path.join(cache_dir, f"{i}{suffix}.npy"), suffix=".tmp.npy") as tmp:
+                np.save(tmp, array)
+        meta_columns.append({"name": name, "kind": kind})
+    mtime_ns, size = _source_stat(csv_path)
+    meta = {"version": CACHE_VERSION, "mtime_ns": mtime_ns, "size": size,
+            "sha256": digest or file_digest(csv_path), "rows": len(df), "columns": meta_columns}
+    _write_meta(cache_dir, meta)
+    return meta
+
+def _load_cache(cache_dir, meta, mmap_mode):
+    data = {}
+    for i, column in enumerate(meta["columns"]):
+        if column["kind"] == "str":
+            codes = np.load(os.path.join(cache_dir, f"{i}.codes.npy"), mmap_mode=mmap_mode)
+            uniques = np.load(os.path.join(cache_dir, f"{i}.values.npy"))
+            # Code -1 picks the trailing NaN
+            values = pd.Series(np.append(uniques.astype(object), np.nan)[codes], dtype="str")
+        else:
+            values = np.asarray(np.load(os.path.join(cache_dir, f"{i}.npy"), mmap_mode=mmap_mode))
+        data[column["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+def read_catalog_csv(csv_path, mmap_mode="c") -> pd.DataFrame:
+    """
+    Load a catalog CSV through its binary sidecar cache.
+    The cache is trusted while the CSV's mtime and size are unchanged. Otherwise
+    the CSV is hashed and the cache is rebuilt only if the content changed.
+    Numeric columns are memory-mapped copy-on-write (mmap_mode='c'), so
+    processes loading the same catalog share its pages until they edit them.
+    Falls back to parsing the CSV if the cache cannot be written.
+    """
+    cache_dir = cache_path(csv_path)
+    meta = _read_meta(cache_dir)
+    if meta is not None:
+        mtime_ns, size = _source_stat(csv_path)
+        if (meta["mtime_ns"], meta["size"]) != (mtime_ns, size):
+            digest = file_digest(csv_path)
+            if digest != meta["sha256"]:
+                meta = None
+            else:
+                # Touched but unchanged: record the new stat so the fast path applies again
+                meta.update(mtime_ns=mtime_ns, size=size)
+                try:
+                    _write_meta(cache_dir, meta)
+                except OSError:
+                    pass
+        if meta is not None:
+            try:
+                return _load_cache(cache_dir, meta, mmap_mode)
+            except (OSError, ValueError, KeyError):
+                pass
+    df = pd.read_csv(csv_path)
+    try:
+        write_cache(df, csv_path)
+    except OSError:
+        pass
+    return df
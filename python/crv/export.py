@@ -0,0 +1,143 @@
+import json
+import os
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+# Rows converted per step by the streaming exporters
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    DataFrame chunks of a catalog: `source` is a DataFrame (sliced into views of
+    chunk_size rows) or an iterable of DataFrames, such as
+    mapping.iter_catalog_chunks, which is passed through.
+    """
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_size):
+            yield source.iloc[start:start + chunk_size]
+    else:
+        yield from source
+
+@contextmanager
+def atomic_path(path, suffix=".tmp"):
+    """
+    Yield a temporary path next to `path` and rename it over `path` when the
+    block succeeds, so readers see either the old file or the complete new one,
+    never a partial write. The temporary file is removed if the block fails.
+    """
+    tmp = f"{path}.{os.getpid()}{suffix}"
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+def write_csv(df, path):
+    """Write a DataFrame to CSV atomically (see atomic_path)."""
+    with atomic_path(path) as tmp:
+        df.to_csv(tmp, index=False)
+
+def _json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def write_jsonl(records, path, append=False):
+    """Write dict records as JSON Lines one at a time. Returns the number written."""
+    count = 0
+    with open(path, "a" if append else "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, default=_json_value, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+def write_json_array(records, path):
+    """Write dict records as a compact JSON array, one element at a time."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(record, default=_json_value, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+def export_jsonl(source, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream catalog rows to JSON Lines, one DataFrame chunk at a time, so memory
+    use is bounded by chunk_size. Returns the number of rows written.
+    """
+    return write_jsonl(_iter_records(source, chunk_size), path)
+
+def _iter_records(source, chunk_size):
+    # json.dumps keeps full float precision; DataFrame.to_json rounds very small values
+    for chunk in iter_chunks(source, chunk_size):
+        columns = list(chunk.columns)
+        for values in chunk.itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+
+def export_columnar(source, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream catalog rows to a compact binary columnar directory: one raw
+    little-endian file per numeric column, int32 dictionary codes per text
+    column, and schema.json (column dtypes, text dictionaries, row count)
+    written last. Only one chunk and the text dictionaries are held in memory.
+    Returns the number of rows written.
+    """
+    os.makedirs(path, exist_ok=True)
+    files, columns, dictionaries = {}, None, {}
+    rows = 0
+    try:
+        for chunk in iter_chunks(source, chunk_size):
+            if columns is None:
+                columns = [{"name": name, "kind": "str" if chunk[name].dtype.kind not in "biuf" else "numeric",
+                            "dtype": None if chunk[name].dtype.kind not in "biuf" else chunk[name].dtype.str}
+                           for name in chunk.columns]
+                for i, column in enumerate(columns):
+                    files[i] = open(os.path.join(path, f"{i}.bin"), "wb")
+            for i, column in enumerate(columns):
+                values = chunk[column["name"]]
+                if column["kind"] == "numeric":
+                    data = values.to_numpy(dtype=np.dtype(column["dtype"]).newbyteorder("<"))
+                else:
+                    lookup = dictionaries.setdefault(i, {})
+                    # Factorize the chunk, then map its labels to the global codes (missing -> -1)
+                    local, labels = pd.factorize(values)
+                    mapping = np.array([lookup.setdefault(str(label), len(lookup)) for label in labels] + [-1],
+                                       dtype="<i4")
+                    data = mapping[local]
+                files[i].write(data.tobytes())
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+    for i, column in enumerate(columns or []):
+        if column["kind"] == "str":
+            column["dtype"] = "<i4"
+            column["values"] = list(dictionaries.get(i, {}))
+    with open(os.path.join(path, "schema.json"), "w") as f:
+        json.dump({"rows": rows, "columns": columns or []}, f)
+    return rows
+
+def load_columnar(path, mmap=True) -> pd.DataFrame:
+    """Read a directory written by export_columnar; numeric columns are memory-mapped copy-on-write."""
+    with open(os.path.join(path, "schema.json")) as f:
+        schema = json.load(f)
+    data = {}
+    for i, column in enumerate(schema["columns"]):
+        file = os.path.join(path, f"{i}.bin")
+        dtype = np.dtype(column["dtype"])
+        if mmap and schema["rows"]:
+            values = np.asarray(np.memmap(file, dtype=dtype, mode="c", shape=(schema["rows"],)))
+        else:
+            values = np.fromfile(file, dtype=dtype)
+        if column["kind"] == "str":
+            values = pd.Series(np.append(np.array(column["values"], dtype=object), np.nan)[values], dtype="str")
+        data[column["name"]] = values
+    return pd.DataFrame(data, copy=False)
@@ -1,42 +1,488 @@
+from bisect import insort
+import json
+import os
+import numpy as np
 import pandas as pd
+from python.crv.cache import read_catalog_csv, write_cache
+from python.crv import export, partition
+from python.crv.analysis import CatalogStats
+from python.crv.lookup import ConstantIndex
+from python.crv.spatial import SpatialIndex
+
+# Columns with a hash index by default: value -> sorted row positions
+INDEXED_COLUMNS = ("Realm", "Solid", "CRV_Name", "CRV_Type")
+POSITION_COLUMNS = ("Position_X", "Position_Y", "Position_Z")
+FREQUENCY_COLUMN = "Frequency_Hz"
+# Columns bulk_update requires to be finite and strictly positive
+POSITIVE_COLUMNS = ("Frequency_Hz", "Wavelength_nm")
+
+class RecordView:
+    """
+    Lazy, read-only sequence of catalog rows as dicts.
+    Rows are looked up in the live DataFrame when accessed, so no records are
+    copied up front; iterate, index or take len() as with a list.
+    """
+    def __init__(self, df, positions=None):
+        self._df = df
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._df) if self._positions is None else len(self._positions)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            positions = np.arange(len(self._df)) if self._positions is None else self._positions
+            return RecordView(self._df, positions[i])
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("record index out of range")
+        position = i if self._positions is None else self._positions[i]
+        row = self._df.iloc[position]
+        return {column: value.item() if isinstance(value, np.generic) else value
+                for column, value in zip(row.index, row.tolist())}
+
+    def __iter__(self):
+        if self._positions is None:
+            return self._records(slice(None))
+        return self._records(self._positions)
+
+    def __repr__(self):
+        return f"RecordView({len(self)} records)"
+
+    def _records(self, positions):
+        rows = self._df.iloc[positions]
+        columns = list(rows.columns)
+        for values in rows.itertuples(index=False, name=None):
+            yield dict(zip(columns, values))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The selected rows as a DataFrame."""
+        return self._df if self._positions is None else self._df.iloc[self._positions]
 
 class CRVCatalog:
     """
     Loads and manages the CRV catalog from a CSV file.
     Allows access, editing, and expansion.
+
+    Lookups go through a Node_ID index and hash indexes on `index_columns`
+    (built on first query of each column), both kept up to date by set_value.
+    The spatial index over node positions and frequencies (see
+    python.crv.spatial) is built on the first spatial query. Call reindex()
+    after modifying `df` directly.
+
+    With cache=True the CSV is loaded through a binary sidecar cache
+    (see python.crv.cache), rebuilt only when the CSV changes.
+
+    save(incremental=True) avoids rewriting the CSV: added nodes are appended
+    to it and edits to saved nodes are appended to a patch log
+    (<csv_path>.patch.jsonl), which is replayed on load. A full save() folds
+    the log back into the CSV.
+
+    csv_path may also be a realm-partitioned directory (see
+    python.crv.partition). Only its manifest is read up front: `realms`
+    selects the partitions to use (default all), partition(realm) loads a
+    single one, and the merged `df` is stitched from the selected partitions
+    on first access, so load time and memory follow the realms actually used.
     """
-    def __init__(self, csv_path="data/crv_catalog.csv"):
+    def __init__(self, csv_path="data/crv_catalog.csv", index_columns=INDEXED_COLUMNS, cache=True, realms=None):
         self.csv_path = csv_path
-        self.df = pd.read_csv(csv_path)
-    
+        self.index_columns = tuple(index_columns)
+        self.cache = cache
+        self.partitioned = partition.is_partitioned(csv_path)
+        self._partitions = {}
+        if self.partitioned:
+            self.manifest = partition.read_manifest(csv_path)
+            self.realms = list(self.manifest["partitions"]) if realms is None else list(realms)
+            unknown = [realm for realm in self.realms if realm not in self.manifest["partitions"]]
+            if unknown:
+                raise ValueError(f"no partition for realms {unknown}")
+            self._df = None
+        else:
+            if realms is not None:
+                raise ValueError("realms requires a partitioned catalog directory")
+            self.df = read_catalog_csv(csv_path) if cache else pd.read_csv(csv_path)
+            self._loaded()
+
+    def _loaded(self):
+        self.reindex()
+        self._mark_saved()
+        self._replay_patches()
+        self._edits = []
+
+    def _ensure_loaded(self):
+        """Stitch the selected partitions into df and build the indexes, on first use."""
+        if self._df is None:
+            self._df = self._stitch()
+            self._loaded()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        self._ensure_loaded()
+        return self._df
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+
+    def _read_partition(self, realm) -> pd.DataFrame:
+        path = os.path.join(str(self.csv_path), self.manifest["partitions"][realm]["file"])
+        return read_catalog_csv(path) if self.cache else pd.read_csv(path)
+
+    def _stitch(self) -> pd.DataFrame:
+        frames = [self.partition(realm) for realm in self.realms]
+        self._partitions = {}
+        if not frames:
+            return pd.DataFrame(columns=self.manifest["columns"])
+        return pd.concat(frames, ignore_index=True)
+
+    def partition(self, realm) -> pd.DataFrame:
+        """
+        Nodes of one realm. On a partitioned catalog whose merged view is not
+        built yet, only that realm's file is read (and kept until the merge).
+        """
+        if not self.partitioned or self._df is not None:
+            return self.df.iloc[self._positions(partition.PARTITION_COLUMN, realm)]
+        if realm not in self.realms:
+            raise ValueError(f"realm {realm!r} is not loaded by this catalog")
+        if realm not in self._partitions:
+            self._partitions[realm] = self._read_partition(realm)
+        return self._partitions[realm]
+
+    @property
+    def patch_path(self):
+        return str(self.csv_path) + ".patch.jsonl"
+
+    def _mark_saved(self):
+        self._saved_rows = len(self.df)
+        self._saved_columns = list(self.df.columns)
+        self._rows_removed = False
+        self._edits = []
+
+    def _replay_patches(self):
+        if not os.path.exists(self.patch_path):
+            return
+        with open(self.patch_path, encoding="utf-8") as f:
+            for line in f:
+                edit = json.loads(line)
+                self.set_value(edit["Node_ID"], edit["column"], edit["value"])
+
+    def reindex(self):
+        """Rebuild the Node_ID index and drop the column indexes, spatial index and statistics."""
+        self._build_id_index()
+        self._indexes = {}
+        self._spatial = None
+        self._stats = None
+        self._constant_indexes = {}
+
+    def _build_id_index(self):
+        self._id_index = {}
+        for position, node_id in enumerate(self.df["Node_ID"].tolist()):
+            self._id_index.setdefault(node_id, position)
+
+    def statistics(self):
+        """
+        Node count, realm distribution, known/new counts and frequency and CRV
+        value min/max/mean. The aggregates are built on first call and then
+        maintained incrementally by add_nodes, set_value and remove_node, so
+        repeated calls cost O(1) unless an extremum was removed.
+        """
+        self._ensure_loaded()
+        if self._stats is None:
+            self._stats = CatalogStats(lambda: self.df)
+        return self._stats.summary()
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Grid index over node positions with a sorted frequency index (built on first use)."""
+        self._ensure_loaded()
+        if self._spatial is None:
+            self._spatial = SpatialIndex(self.df[list(POSITION_COLUMNS)].to_numpy(dtype=float),
+                                         self.df[FREQUENCY_COLUMN].to_numpy(dtype=float))
+        return self._spatial
+
+    def _column_index(self, column):
+        self._ensure_loaded()
+        if column not in self._indexes:
+            index = {}
+            for position, value in enumerate(self.df[column].tolist()):
+                index.setdefault(value, []).append(position)
+            self._indexes[column] = index
+        return self._indexes[column]
+
+    def _positions(self, column, value):
+        if column in self.index_columns:
+            return np.array(self._column_index(column).get(value, []), dtype=np.intp)
+        return np.flatnonzero(self.df[column].to_numpy() == value)
+
     def get_node(self, node_id):
         """Return node as dict given Node_ID."""
-        node = self.df[self.df["Node_ID"] == node_id]
-        if node.empty:
+        self._ensure_loaded()
+        position = self._id_index.get(node_id)
+        if position is None:
             return None
-        return node.to_dict(orient="records")[0]
-    
+        return RecordView(self.df, [position])[0]
+
     def get_by_column(self, column, value):
-        """Return all nodes matching a column value."""
-        return self.df[self.df[column] == value].to_dict(orient="records")
-    
+        """Return all nodes matching a column value, as a lazy RecordView."""
+        return RecordView(self.df, self._positions(column, value))
+
+    def add_nodes(self, records):
+        """Append nodes (a DataFrame or list of dicts with the catalog columns)."""
+        self._ensure_loaded()
+        new = records if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+        start = len(self.df)
+        self.df = pd.concat([self.df, new], ignore_index=True)
+        for position, node_id in enumerate(self.df["Node_ID"].iloc[start:].tolist(), start):
+            self._id_index.setdefault(node_id, position)
+        for column, index in self._indexes.items():
+            for position, value in enumerate(self.df[column].iloc[start:].tolist(), start):
+                index.setdefault(value, []).append(position)
+        self._spatial = None
+        self._constant_indexes = {}
+        if self._stats is not None:
+            self._stats.add(self.df.iloc[start:])
+
+    def remove_node(self, node_id):
+        """Delete a node. Later rows shift up, so the next save rewrites the full CSV."""
+        self._ensure_loaded()
+        position = self._id_index.get(node_id)
+        if position is None:
+            return False
+        record = self.get_node(node_id)
+        stats = self._stats
+        self.df = self.df.drop(index=self.df.index[position]).reset_index(drop=True)
+        self.reindex()
+        if position < self._saved_rows:
+            self._saved_rows -= 1
+            self._rows_removed = True
+        if stats is not None:
+            stats.remove(record)
+            self._stats = stats
+        return True
+
     def add_column(self, column_name, default=None):
         """Add a new column (keeps data compatible)."""
         if column_name not in self.df.columns:
             self.df[column_name] = default
-    
+
     def set_value(self, node_id, column, value):
         """Edit a value for a node."""
-        idx = self.df.index[self.df["Node_ID"] == node_id]
-        if len(idx) == 0:
+        self._ensure_loaded()
+        position = self._id_index.get(node_id)
+        if position is None:
             return False
-        self.df.at[idx[0], column] = value
+        self.add_column(column)
+        old = self.df.iat[position, self.df.columns.get_loc(column)]
+        self.df.iat[position, self.df.columns.get_loc(column)] = value
+        if position < self._saved_rows:
+            self._edits.append({"Node_ID": node_id, "column": column, "value": value})
+        if self._stats is not None:
+            self._stats.edit(column, old, value)
+        if column in ("CRV_Name", "CRV_Value", "Is_Known_Constant"):
+            self._constant_indexes = {}
+        if column == "Node_ID":
+            self._build_id_index()
+        elif column in self._indexes:
+            index = self._indexes[column]
+            index[old].remove(position)
+            if not index[old]:
+                del index[old]
+            insort(index.setdefault(value, []), position)
+        if self._spatial is not None:
+            if column in POSITION_COLUMNS:
+                self._spatial.update(position, position=self.df.iloc[position][list(POSITION_COLUMNS)]
+                                     .to_numpy(dtype=float))
+            elif column == FREQUENCY_COLUMN:
+                self._spatial.update(position, frequency=float(value))
         return True
-    
-    def save(self, path=None):
-        """Save changes to CSV."""
-        self.df.to_csv(path or self.csv_path, index=False)
-    
+
+    def bulk_update(self, node_ids, values, save=False):
+        """
+        Set many cells in one step. `values` maps column -> new values aligned
+        with `node_ids`; a repeated Node_ID keeps its last value. Everything is
+        validated first: unknown Node_IDs, values of the wrong type for an
+        existing column, infinite numbers and non-positive Frequency_Hz or
+        Wavelength_nm raise ValueError and leave the catalog unchanged. Each
+        column is then written with one indexed assignment and the indexes and
+        statistics are updated in O(k) for k nodes (an edited hash-indexed
+        column or position/frequency column has its index rebuilt on next use).
+        With save=True the catalog is then saved, atomically replacing the CSV.
+        Returns the number of nodes updated.
+        """
+        self._ensure_loaded()
+        node_ids = np.asarray(node_ids).reshape(-1)
+        positions = np.fromiter((self._id_index.get(node_id, -1) for node_id in node_ids.tolist()),
+                                dtype=np.intp, count=len(node_ids))
+        if np.any(positions < 0):
+            raise ValueError(f"unknown Node_IDs {node_ids[positions < 0][:10].tolist()}")
+        # Keep the last occurrence of each node
+        _, last = np.unique(positions[::-1], return_index=True)
+        keep = np.sort(len(positions) - 1 - last)
+        positions = positions[keep]
+        columns = {column: self._validated(column, column_values, len(node_ids))[keep]
+                   for column, column_values in values.items()}
+
+        saved = positions < self._saved_rows
+        saved_ids = self.df["Node_ID"].iloc[positions[saved]].tolist()
+        for column, new in columns.items():
+            self.add_column(column)
+            old = self.df[column].iloc[positions].to_numpy()
+            self.df.iloc[positions, self.df.columns.get_loc(column)] = new
+            self._edits.extend({"Node_ID": node_id, "column": column, "value": value}
+                               for node_id, value in zip(saved_ids, new[saved].tolist()))
+            if self._stats is not None:
+                self._stats.edit(column, old, new)
+            self._indexes.pop(column, None)
+        if columns.keys() & {"CRV_Name", "CRV_Value", "Is_Known_Constant"}:
+            self._constant_indexes = {}
+        if columns.keys() & {*POSITION_COLUMNS, FREQUENCY_COLUMN}:
+            self._spatial = None
+        if save:
+            self.save()
+        return len(positions)
+
+    def _validated(self, column, values, n):
+        """`values` as an array that can be stored in `column`, or ValueError."""
+        values = np.asarray(values).reshape(-1)
+        if len(values) != n:
+            raise ValueError(f"{column}: got {len(values)} values for {n} Node_IDs")
+        if column == "Node_ID":
+            raise ValueError("Node_ID cannot be bulk-updated; use set_value")
+        numeric = values.dtype.kind in "biuf"
+        if column in self.df.columns:
+            dtype = self.df[column].dtype
+            if dtype.kind in "biuf":
+                if not numeric or (dtype.kind == "b") != (values.dtype.kind == "b"):
+                    raise ValueError(f"{column}: expected {dtype} values, got {values.dtype}")
+                if dtype.kind in "iu" and not np.array_equal(values, np.round(values)):
+                    raise ValueError(f"{column}: expected integer values")
+                values = values.astype(dtype)
+            elif numeric:
+                raise ValueError(f"{column}: expected text values, got {values.dtype}")
+            else:
+                values = values.astype(object)
+        if numeric and np.any(np.isinf(values)):
+            raise ValueError(f"{column}: values must not be infinite")
+        if column in POSITIVE_COLUMNS and not (numeric and np.all(values > 0)):
+            raise ValueError(f"{column}: values must be positive numbers")
+        return values
+
+    def _node_ids(self, rows):
+        ids = self.df["Node_ID"].to_numpy()[np.maximum(rows, 0)]
+        return np.where(rows >= 0, ids, -1)
+
+    def nearest_nodes(self, points, k=1, band=None):
+        """
+        Node_IDs and distances of the k nodes nearest each of (Q, 3) points,
+        optionally among nodes with Frequency_Hz in band=(low, high).
+        Returns two (Q, k) arrays; missing neighbours are -1 / inf.
+        """
+        rows, distances = self.spatial_index.knn(points, k=k, band=band)
+        return self._node_ids(rows), distances
+
+    def nodes_within(self, points, radius, band=None):
+        """
+        Node_IDs within `radius` of each of (Q, 3) points, nearest first.
+        Returns (node_ids, distances, offsets); query i owns [offsets[i]:offsets[i + 1]].
+        """
+        rows, distances, offsets = self.spatial_index.radius(points, radius, band=band)
+        return self._node_ids(rows), distances, offsets
+
+    def nodes_in_band(self, low, high):
+        """Nodes with low <= Frequency_Hz <= high, in increasing frequency, as a RecordView."""
+        return RecordView(self.df, self.spatial_index.frequency_band(low, high))
+
+    def constant_index(self, known_only=True, pairs=False, relative=False) -> ConstantIndex:
+        """Sorted reverse-lookup index over CRV values (built once per option set)."""
+        self._ensure_loaded()
+        key = (known_only, pairs, relative)
+        if key not in self._constant_indexes:
+            self._constant_indexes[key] = ConstantIndex(self.df, known_only, pairs, relative)
+        return self._constant_indexes[key]
+
+    def nearest_constant(self, values, known_only=True, pairs=False, relative=False):
+        """
+        Closest catalog constant (or, with pairs=True, product or ratio of two
+        constants) to each value. Returns one dict per value with the
+        expression, matched value, error and the node records involved.
+        """
+        index = self.constant_index(known_only, pairs, relative)
+        expressions, matched, errors, rows = index.nearest(values)
+        view = RecordView(self.df)
+        return [{"value": float(value), "expression": expression, "match": float(match), "error": float(error),
+                 "nodes": [view[row] for row in pair if row >= 0]}
+                for value, expression, match, error, pair in
+                zip(np.asarray(values, dtype=float).reshape(-1), expressions, matched, errors, rows)]
+
+    def save(self, path=None, incremental=False):
+        """
+        Save changes to CSV (and refresh its cache). Full saves write a
+        temporary file and rename it over the CSV, so a crash mid-save never
+        leaves a truncated catalog.
+        With incremental=True, only nodes added since the last save are written
+        (appended to the CSV) and edits to earlier nodes go to the patch log.
+        Saving elsewhere, or after adding columns or removing nodes, always
+        writes the full CSV.
+
+        A partitioned catalog rewrites the partitions of its loaded realms and
+        the manifest; partitions that were not loaded are left untouched.
+        """
+        if self.partitioned:
+            if path is not None and path != self.csv_path:
+                partition.write_partitions(self.df, path)
+            else:
+                self._save_partitions()
+            return
+        path = path or self.csv_path
+        if incremental and path == self.csv_path and list(self.df.columns) == self._saved_columns \
+                and not self._rows_removed:
+            self.df.iloc[self._saved_rows:].to_csv(path, mode="a", header=False, index=False)
+            if self._edits:
+                export.write_jsonl(self._edits, self.patch_path, append=True)
+            self._mark_saved()
+            return
+        export.write_csv(self.df, path)
+        if self.cache:
+            write_cache(self.df, path)
+        if path == self.csv_path:
+            if os.path.exists(self.patch_path):
+                os.remove(self.patch_path)
+            self._mark_saved()
+
+    def _save_partitions(self):
+        if self._df is None:
+            return
+        # Nodes moved into a realm that was not loaded: merge that partition in first
+        for realm in self.df[partition.PARTITION_COLUMN].unique().tolist():
+            if realm not in self.realms:
+                if realm in self.manifest["partitions"]:
+                    self.add_nodes(self._read_partition(realm))
+                self.realms.append(realm)
+        directory = str(self.csv_path)
+        groups = dict(list(self.df.groupby(partition.PARTITION_COLUMN, sort=False)))
+        for realm in self.realms:
+            rows = groups.get(realm, self.df.iloc[:0])
+            path = os.path.join(directory, partition.partition_file(realm))
+            export.write_csv(rows, path)
+            if self.cache:
+                write_cache(rows.reset_index(drop=True), path)
+        summary = partition.partition_summary(self.df)
+        for realm in self.realms:
+            self.manifest["partitions"][realm] = summary.get(
+                realm, {"file": partition.partition_file(realm), "rows": 0, "min_node_id": None, "max_node_id": None})
+        self.manifest["columns"] = list(self.df.columns)
+        partition.write_manifest(directory, self.manifest)
+        self._mark_saved()
+
+    def export_jsonl(self, path, chunk_size=export.DEFAULT_CHUNK_SIZE):
+        """Stream the catalog to JSON Lines a chunk at a time. Returns the row count."""
+        return export.export_jsonl(self.df, path, chunk_size)
+
+    def export_columnar(self, path, chunk_size=export.DEFAULT_CHUNK_SIZE):
+        """Stream the catalog to a binary columnar directory (see export.load_columnar)."""
+        return export.export_columnar(self.df, path, chunk_size)
+
     def all_nodes(self):
-        """Return all nodes as dicts."""
-        return self.df.to_dict(orient="records")
+        """Return all nodes as a lazy RecordView of dicts."""
+        return RecordView(self.df)
@@ -0,0 +1,96 @@
+import numpy as np
+
+class ConstantIndex:
+    """
+    Sorted index over catalog CRV values for nearest-constant reverse lookup.
+    Each distinct (CRV_Name, CRV_Value) constant is indexed once, pointing at its
+    first catalog row. With pairs=True, the products and ratios of every pair of
+    constants are precomputed and indexed too. Queries are batched binary
+    searches (np.searchsorted), O(log n) each.
+
+    With relative=True, closeness is measured by ratio (in log space) instead of
+    absolute difference; only positive values can then be matched.
+    """
+
+    def __init__(self, df, known_only=True, pairs=False, relative=False):
+        rows = np.flatnonzero(df["Is_Known_Constant"].to_numpy(dtype=bool)) if known_only else np.arange(len(df))
+        names = df["CRV_Name"].to_numpy(dtype=object)[rows]
+        values = df["CRV_Value"].to_numpy(dtype=float)[rows]
+        # One entry per distinct constant
+        _, first = np.unique(np.array([f"{n}\0{v!r}" for n, v in zip(names, values)]), return_index=True)
+        first.sort()
+        self.relative = relative
+        self.rows = rows[first]
+        self.names = names[first]
+        self.values = values[first]
+
+        n = len(self.values)
+        left, right = np.arange(n), np.full(n, -1)
+        ops = np.zeros(n, dtype=np.int8)
+        combined = [self.values]
+        if pairs:
+            i, j = np.meshgrid(np.arange(n), np.arange(n), indexing="ij")
+            upper = i <= j
+            off_diagonal = i != j
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                products = self.values[i[upper]] * self.values[j[upper]]
+                ratios = self.values[i[off_diagonal]] / self.values[j[off_diagonal]]
+            left = np.concatenate([left, i[upper], i[off_diagonal]])
+            right = np.concatenate([right, j[upper], j[off_diagonal]])
+            ops = np.concatenate([ops, np.full(len(products), 1, np.int8), np.full(len(ratios), 2, np.int8)])
+            combined += [products, ratios]
+        combined = np.concatenate(combined)
+
+        keep = np.isfinite(combined) & (combined > 0 if relative else True)
+        keys = np.log(combined[keep]) if relative else combined[keep]
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._values = combined[keep][order]
+        self._left = left[keep][order]
+        self._right = right[keep][order]
+        self._ops = ops[keep][order]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def expression(self, entry) -> str:
+        """Readable form of an index entry, e.g. 'pi', 'pi*e' or 'tau/phi'."""
+        name = self.names[self._left[entry]]
+        if self._ops[entry] == 0:
+            return name
+        return f"{name}{'*' if self._ops[entry] == 1 else '/'}{self.names[self._right[entry]]}"
+
+    def nearest_entries(self, values) -> np.ndarray:
+        """Index entry closest to each query value (-1 where nothing can match)."""
+        values = np.asarray(values, dtype=float)
+        if not len(self._keys):
+            return np.full(values.shape, -1, dtype=np.intp)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            keys = np.log(values) if self.relative else values
+        hi = np.clip(np.searchsorted(self._keys, keys), 1, len(self._keys) - 1) if len(self._keys) > 1 \
+            else np.zeros(values.shape, dtype=np.intp)
+        lo = np.maximum(hi - 1, 0)
+        entry = np.where(np.abs(self._keys[lo] - keys) <= np.abs(self._keys[hi] - keys), lo, hi)
+        return np.where(np.isnan(keys), -1, entry)
+
+    def nearest(self, values):
+        """
+        Closest constant or pair expression to each query value.
+        Returns (expressions, matched values, errors, catalog rows) where errors
+        are value - match (or log(value / match) when relative) and rows is an
+        (N, 2) array of the catalog rows of the constants involved (-1 if unused).
+        """
+        values = np.asarray(values, dtype=float).reshape(-1)
+        entry = self.nearest_entries(values)
+        found = entry >= 0
+        safe = np.where(found, entry, 0)
+        matched = np.where(found, self._values[safe] if len(self) else np.nan, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            errors = np.log(values / matched) if self.relative else values - matched
+        rows = np.full((len(values), 2), -1, dtype=np.intp)
+        if len(self):
+            rows[found, 0] = self.rows[self._left[safe[found]]]
+            right = self._right[safe[found]]
+            rows[found, 1] = np.where(right >= 0, self.rows[np.maximum(right, 0)], -1)
+        expressions = np.array([self.expression(e) if e >= 0 else None for e in entry], dtype=object)
+        return expressions, matched, errors, rows
@@ -1,7 +1,23 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
+import pandas as pd
 from python.hgr.core import HGR
-from python.hgr.generators import generate_sphere_points, generate_noisy_tetrahedron, generate_torus_points
+from python.hgr.generators import generate_noisy_tetrahedron, generate_torus_points
+from python.hgr.solids import get_solid
 from python.crv.node import CRVNode
+from python.crv.export import write_jsonl, write_json_array
+from python.crv.partition import write_partitions
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+# Combinations enumerated by the full catalog builder
+CATALOG_SOLIDS = ('tetrahedron', 'cube', 'octahedron', 'dodecahedron', 'icosahedron')
+NODE_TYPES = ('vertex', 'edge', 'face')
+CATALOG_COLUMNS = ["Node_ID", "Solid", "Node_Type", "Node_Index", "Position_X", "Position_Y", "Position_Z",
+                   "CRV_Name", "CRV_Value", "CRV_Symbol", "CRV_Type", "Is_Known_Constant", "Realm",
+                   "Wavelength_nm", "Frequency_Hz", "Description", "Stability"]
 
 # Example CRV catalog builder for one realm and type
 def build_crv_catalog():
@@ -9,11 +25,10 @@ def build_crv_catalog():
     node_id = 1
 
     # Sphere (Ideal) - Quantum realm example
-    sphere_points = generate_sphere_points(4)  # For Tetrahedron vertices
-    for idx, pos in enumerate(sphere_points):
-        crv_val = HGR.crv_from_geometry('sphere', pos)
-        stability = HGR.calculate_stability(crv_val)
-        freq = HGR.assign_frequency(crv_val, 'quantum')
+    sphere_points = get_solid('tetrahedron').vertices  # Tetrahedron vertices on the unit sphere
+    crv_vals = HGR.crv_from_geometry_batch('sphere', sphere_points)
+    freqs = HGR.assign_frequency_batch(crv_vals, 'quantum')
+    for idx, (pos, freq) in enumerate(zip(sphere_points, freqs)):
         node = CRVNode(
             node_id=node_id,
             solid='tetrahedron',
@@ -60,7 +75,124 @@ def build_crv_catalog():
     return catalog
 
 def export_crv_catalog(catalog, filename="crv_catalog.json"):
-    import json
-    nodes_dict = [node.to_dict() for node in catalog]
-    with open(filename, "w") as f:
-        json.dump(nodes_dict, f, indent=2)
+    """
+    Stream CRV nodes to `filename` one node at a time: JSON Lines for a .jsonl
+    name, otherwise a compact JSON array. `catalog` may be any iterable of
+    CRVNode, including a CRVNodeTable or a generator.
+    """
+    records = (node.to_dict() for node in catalog)
+    if str(filename).endswith(".jsonl"):
+        return write_jsonl(records, filename)
+    return write_json_array(records, filename)
+
+def _element_positions(solid, node_type):
+    """Vertex, edge-midpoint or face-center positions of a solid, scaled to [0, 1] like the CSV."""
+    geometry = get_solid(solid)
+    elements = {'vertex': geometry.vertices, 'edge': geometry.edge_midpoints,
+                'face': geometry.face_centers}[node_type]
+    low, high = geometry.vertices.min(), geometry.vertices.max()
+    return (elements - low) / (high - low)
+
+def _combination_seed(seed, realm, solid, node_type):
+    """
+    Independent seed for one realm x solid x node-type combination. It depends
+    only on the combination's place in REALMS / CATALOG_SOLIDS / NODE_TYPES, so
+    results are the same whichever realms are built and on how many workers.
+    """
+    realm_seq = np.random.SeedSequence(seed).spawn(len(HGR.REALMS))[HGR.REALMS.index(realm)]
+    combos = realm_seq.spawn(len(CATALOG_SOLIDS) * len(NODE_TYPES))
+    return combos[CATALOG_SOLIDS.index(solid) * len(NODE_TYPES) + NODE_TYPES.index(node_type)]
+
+def realm_node_count(solids=CATALOG_SOLIDS, node_types=NODE_TYPES, samples=1):
+    """Number of catalog rows one realm produces."""
+    return samples * sum(len(_element_positions(solid, node_type)) for solid in solids for node_type in node_types)
+
+def iter_realm_chunks(realm, start_id=1, solids=CATALOG_SOLIDS, node_types=NODE_TYPES, samples=1, noise=0.0,
+                      seed=None, chunk_size=1 << 16):
+    """
+    Yield catalog rows for one realm as DataFrames of at most chunk_size rows.
+    Each solid x node type contributes `samples` nodes per element, perturbed by
+    Gaussian noise of standard deviation `noise`; CRVs, stabilities and
+    frequencies are computed for a whole chunk at once.
+    """
+    if realm not in HGR.REALMS:
+        raise ValueError(f"Unknown realm '{realm}'. Choose from {list(HGR.REALMS)}.")
+    node_id = start_id
+    for solid in solids:
+        for node_type in node_types:
+            elements = _element_positions(solid, node_type)
+            rng = np.random.default_rng(_combination_seed(seed, realm, solid, node_type))
+            total = samples * len(elements)
+            for start in range(0, total, chunk_size):
+                index = np.arange(start, min(start + chunk_size, total)) % len(elements)
+                positions = elements[index]
+                if noise:
+                    positions = positions + rng.normal(0, noise, positions.shape)
+                crv = HGR.crv_from_geometry_batch(solid, positions)
+                frequency = HGR.assign_frequency_batch(crv, realm)
+                yield pd.DataFrame({
+                    "Node_ID": np.arange(node_id, node_id + len(index)),
+                    "Solid": solid,
+                    "Node_Type": node_type,
+                    "Node_Index": index,
+                    "Position_X": positions[:, 0],
+                    "Position_Y": positions[:, 1],
+                    "Position_Z": positions[:, 2],
+                    "CRV_Name": f"{solid}_{node_type}",
+                    "CRV_Value": crv,
+                    "CRV_Symbol": "",
+                    "CRV_Type": "geometric",
+                    "Is_Known_Constant": False,
+                    "Realm": realm,
+                    "Wavelength_nm": SPEED_OF_LIGHT / frequency * 1e9,
+                    "Frequency_Hz": frequency,
+                    "Description": f"Generated {node_type} of {solid} in the {realm} realm",
+                    "Stability": HGR.calculate_stability_batch(crv),
+                }, columns=CATALOG_COLUMNS)
+                node_id += len(index)
+
+def _realm_frame(realm, start_id, options):
+    chunks = list(iter_realm_chunks(realm, start_id, **options))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=CATALOG_COLUMNS)
+
+def iter_catalog_chunks(realms=HGR.REALMS, workers=1, **options):
+    """
+    Yield the full catalog (every realm x solid x node type) as DataFrame chunks
+    in Node_ID order. Each realm's Node_IDs start at a fixed offset given by
+    its place in HGR.REALMS, so with workers > 1 each realm is built in its
+    own process, and realms built in separate jobs never collide: a subset
+    matches the same rows of the full build. `options` go to iter_realm_chunks.
+    """
+    per_realm = realm_node_count(options.get('solids', CATALOG_SOLIDS), options.get('node_types', NODE_TYPES),
+                                 options.get('samples', 1))
+    unknown = [realm for realm in realms if realm not in HGR.REALMS]
+    if unknown:
+        raise ValueError(f"Unknown realm '{unknown[0]}'. Choose from {list(HGR.REALMS)}.")
+    starts = [1 + HGR.REALMS.index(realm) * per_realm for realm in realms]
+    workers = min(workers or os.cpu_count() or 1, max(len(realms), 1))
+    if workers == 1:
+        for realm, start_id in zip(realms, starts):
+            yield from iter_realm_chunks(realm, start_id, **options)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_realm_frame, realms, starts, [options] * len(realms))
+
+def build_full_catalog(path=None, realms=HGR.REALMS, workers=1, partitioned=False, **options):
+    """
+    Build the full generated catalog. With `path`, chunks are streamed to a CSV
+    (readable by CRVCatalog) and the row count is returned; otherwise the
+    catalog is returned as a DataFrame. With partitioned=True, `path` is a
+    directory receiving one CSV per realm (see python.crv.partition).
+    """
+    chunks = iter_catalog_chunks(realms, workers=workers, **options)
+    if path is None:
+        return pd.concat(chunks, ignore_index=True)
+    if partitioned:
+        manifest = write_partitions(chunks, path)
+        return sum(entry["rows"] for entry in manifest["partitions"].values())
+    rows = 0
+    pd.DataFrame(columns=CATALOG_COLUMNS).to_csv(path, index=False)
+    for chunk in chunks:
+        chunk.to_csv(path, mode="a", header=False, index=False)
+        rows += len(chunk)
+    return rows
@@ -5,6 +5,9 @@ class CRVNode:
     Represents a Core Resonance Value (CRV) node in the UBP system.
     Contains geometric, mathematical, and physical attributes.
     """
+    __slots__ = ("node_id", "solid", "node_type", "position", "crv_name", "crv_value", "crv_symbol",
+                 "known_constant", "realm", "frequency", "proposed_name", "rune_concept")
+
     def __init__(
         self,
         node_id: int,
@@ -48,3 +51,131 @@ class CRVNode:
             "Proposed_Name": self.proposed_name,
             "Rune_Concept": self.rune_concept
         }
+
+
+def encode_categories(values, categories=()):
+    """
+    Integer-code an array of labels. Codes index into the returned categories,
+    which start with `categories` and are extended by any new labels in sorted order.
+    """
+    values = np.asarray(values, dtype=object)
+    unique, inverse = np.unique(values.astype(str), return_inverse=True)
+    lookup = {label: code for code, label in enumerate(categories)}
+    for label in unique.tolist():
+        lookup.setdefault(label, len(lookup))
+    mapping = np.array([lookup[label] for label in unique.tolist()], dtype=np.int32)
+    return mapping[inverse.reshape(-1)], tuple(lookup)
+
+
+class CRVNodeTable:
+    """
+    Struct-of-arrays collection of CRV nodes.
+    Numeric attributes are typed arrays (node_id int64, position float64 (N, 3),
+    crv_value, frequency float64, known_constant bool). Text attributes are stored
+    as int32 codes into a tuple of categories, so a column of repeated labels
+    costs 4 bytes per node. Indexing with an integer gives a CRVNode; slices,
+    index arrays and boolean masks give a sub-table.
+    """
+    NUMERIC_FIELDS = ("node_id", "position", "crv_value", "known_constant", "frequency")
+    CATEGORICAL_FIELDS = ("solid", "node_type", "crv_name", "crv_symbol", "realm", "proposed_name",
+                          "rune_concept")
+
+    def __init__(self, node_id, position, crv_value, known_constant, frequency, codes, categories):
+        self.node_id = np.asarray(node_id, dtype=np.int64)
+        self.position = np.asarray(position, dtype=np.float64).reshape(-1, 3)
+        self.crv_value = np.asarray(crv_value, dtype=np.float64)
+        self.known_constant = np.asarray(known_constant, dtype=bool)
+        self.frequency = np.asarray(frequency, dtype=np.float64)
+        self.codes = {field: np.asarray(codes[field], dtype=np.int32) for field in self.CATEGORICAL_FIELDS}
+        self.categories = {field: tuple(categories[field]) for field in self.CATEGORICAL_FIELDS}
+
+    @classmethod
+    def from_columns(cls, node_id, position, crv_value, known_constant, frequency, categories=None, **labels):
+        """
+        Build a table from column arrays; text columns are passed by field name
+        as label arrays (missing ones default to ""). `categories` optionally
+        fixes the leading categories of a field, e.g. {"realm": HGR.REALMS}.
+        """
+        categories = categories or {}
+        n = len(node_id)
+        codes, cats = {}, {}
+        for field in cls.CATEGORICAL_FIELDS:
+            values = labels.get(field, "")
+            if np.ndim(values) == 0:
+                values = np.full(n, values, dtype=object)
+            codes[field], cats[field] = encode_categories(values, categories.get(field, ()))
+        return cls(node_id, position, crv_value, known_constant, frequency, codes, cats)
+
+    @classmethod
+    def from_nodes(cls, nodes):
+        nodes = list(nodes)
+        return cls.from_columns(
+            node_id=[node.node_id for node in nodes],
+            position=np.array([node.position for node in nodes], dtype=float).reshape(-1, 3),
+            crv_value=[node.crv_value for node in nodes],
+            known_constant=[node.known_constant for node in nodes],
+            frequency=[node.frequency for node in nodes],
+            **{field: [getattr(node, field) for node in nodes] for field in cls.CATEGORICAL_FIELDS})
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build a table from a catalog DataFrame (the data/crv_catalog.csv columns)."""
+        optional = {"proposed_name": "Proposed_Name", "rune_concept": "Rune_Concept"}
+        return cls.from_columns(
+            node_id=df["Node_ID"].to_numpy(),
+            position=df[["Position_X", "Position_Y", "Position_Z"]].to_numpy(dtype=float),
+            crv_value=df["CRV_Value"].to_numpy(dtype=float),
+            known_constant=df["Is_Known_Constant"].to_numpy(dtype=bool),
+            frequency=df["Frequency_Hz"].to_numpy(dtype=float),
+            solid=df["Solid"].to_numpy(dtype=object),
+            node_type=df["Node_Type"].to_numpy(dtype=object),
+            crv_name=df["CRV_Name"].to_numpy(dtype=object),
+            crv_symbol=df["CRV_Symbol"].to_numpy(dtype=object),
+            realm=df["Realm"].to_numpy(dtype=object),
+            **{field: df[column].fillna("").to_numpy(dtype=object)
+               for field, column in optional.items() if column in df.columns})
+
+    @classmethod
+    def concat(cls, tables):
+        """Join tables, merging their categories."""
+        tables = list(tables)
+        codes, cats = {}, {}
+        for field in cls.CATEGORICAL_FIELDS:
+            lookup = {}
+            for table in tables:
+                for label in table.categories[field]:
+                    lookup.setdefault(label, len(lookup))
+            codes[field] = np.concatenate(
+                [np.array([lookup[label] for label in table.categories[field]], dtype=np.int32)[table.codes[field]]
+                 for table in tables]) if tables else np.empty(0, dtype=np.int32)
+            cats[field] = tuple(lookup)
+        numeric = {field: np.concatenate([getattr(table, field) for table in tables]) if tables
+                   else np.empty((0, 3) if field == "position" else 0) for field in cls.NUMERIC_FIELDS}
+        return cls(codes=codes, categories=cats, **numeric)
+
+    def __len__(self):
+        return len(self.node_id)
+
+    def labels(self, field) -> np.ndarray:
+        """Decoded text column as an object array."""
+        return np.array(self.categories[field], dtype=object)[self.codes[field]]
+
+    def __getitem__(self, index):
+        if np.ndim(index) == 0 and not isinstance(index, slice):
+            return CRVNode(
+                node_id=int(self.node_id[index]),
+                position=self.position[index],
+                crv_value=float(self.crv_value[index]),
+                known_constant=bool(self.known_constant[index]),
+                frequency=float(self.frequency[index]),
+                **{field: self.categories[field][self.codes[field][index]] for field in self.CATEGORICAL_FIELDS})
+        return CRVNodeTable(self.node_id[index], self.position[index], self.crv_value[index],
+                            self.known_constant[index], self.frequency[index],
+                            {field: codes[index] for field, codes in self.codes.items()}, self.categories)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"CRVNodeTable({len(self)} nodes)"
@@ -0,0 +1,61 @@
+import json
+import os
+import re
+from python.crv.export import atomic_path, iter_chunks, DEFAULT_CHUNK_SIZE
+
+# A partitioned catalog is a directory with one CSV per realm and this manifest
+MANIFEST = "manifest.json"
+PARTITION_COLUMN = "Realm"
+
+def is_partitioned(path) -> bool:
+    return os.path.isfile(os.path.join(str(path), MANIFEST))
+
+def partition_file(realm) -> str:
+    """File name of a realm's partition."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(realm)) + ".csv"
+
+def read_manifest(directory) -> dict:
+    with open(os.path.join(str(directory), MANIFEST)) as f:
+        return json.load(f)
+
+def write_manifest(directory, manifest):
+    # Written last and replaced atomically, so readers never see a partial manifest
+    with atomic_path(os.path.join(str(directory), MANIFEST)) as tmp, open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+def write_partitions(source, directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split a catalog into one CSV per Realm under `directory`, plus a manifest of
+    the columns and each partition's file, row count and Node_ID range.
+    `source` is a DataFrame or an iterable of DataFrame chunks (streamed, so
+    generated catalogs never need to fit in memory). Returns the manifest.
+    """
+    directory = str(directory)
+    os.makedirs(directory, exist_ok=True)
+    partitions, columns = {}, None
+    for chunk in iter_chunks(source, chunk_size):
+        columns = columns or list(chunk.columns)
+        for realm, rows in chunk.groupby(PARTITION_COLUMN, sort=False):
+            entry = partitions.get(realm)
+            path = os.path.join(directory, partition_file(realm))
+            rows.to_csv(path, mode="a" if entry else "w", header=not entry, index=False)
+            if entry is None:
+                entry = partitions[realm] = {"file": partition_file(realm), "rows": 0,
+                                             "min_node_id": None, "max_node_id": None}
+            ids = rows["Node_ID"]
+            entry["rows"] += len(rows)
+            entry["min_node_id"] = int(ids.min()) if entry["min_node_id"] is None else \
+                min(entry["min_node_id"], int(ids.min()))
+            entry["max_node_id"] = int(ids.max()) if entry["max_node_id"] is None else \
+                max(entry["max_node_id"], int(ids.max()))
+    manifest = {"partition_column": PARTITION_COLUMN, "columns": columns or [], "partitions": partitions}
+    write_manifest(directory, manifest)
+    return manifest
+
+def partition_summary(df) -> dict:
+    """Manifest entries for partitions held in memory."""
+    summary = {}
+    for realm, rows in df.groupby(PARTITION_COLUMN, sort=False):
+        summary[realm] = {"file": partition_file(realm), "rows": len(rows),
+                          "min_node_id": int(rows["Node_ID"].min()), "max_node_id": int(rows["Node_ID"].max())}
+    return summary
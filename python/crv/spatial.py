@@ -0,0 +1,249 @@
+from itertools import product
+import numpy as np
+
+class SpatialIndex:
+    """
+    Uniform-grid spatial index over node positions, with a sorted frequency index.
+
+    Points are bucketed into cubic cells holding about `points_per_cell` nodes
+    and stored in cell order, so the candidates of a query are a few contiguous
+    slices. Queries are answered a block of query points at a time with array
+    operations only. k-NN searches grow a cube of cells around each query until
+    the k-th distance is provably within it.
+
+    Rows are positions in the original arrays (catalog row positions). update()
+    moves a node without a rebuild: its stale cell entry is masked and the node
+    is checked directly by every query until the grid is rebuilt, which happens
+    once more than `rebuild_fraction` of the nodes have moved.
+    """
+
+    def __init__(self, positions, frequencies=None, points_per_cell=2.0, rebuild_fraction=0.05):
+        self.positions = np.array(positions, dtype=float)
+        if self.positions.ndim != 2:
+            raise ValueError("positions must be an (N, dim) array")
+        self.frequencies = None if frequencies is None else np.array(frequencies, dtype=float)
+        self.points_per_cell = points_per_cell
+        self.rebuild_fraction = rebuild_fraction
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def dim(self) -> int:
+        return self.positions.shape[1]
+
+    def rebuild(self):
+        """Re-bucket every node and re-sort the frequency index."""
+        n = max(len(self.positions), 1)
+        self.lower = self.positions.min(axis=0) if len(self.positions) else np.zeros(self.dim)
+        span = self.positions.max(axis=0) - self.lower if len(self.positions) else np.zeros(self.dim)
+        cells_per_axis = max(1, int(np.ceil((n / self.points_per_cell) ** (1 / self.dim))))
+        self.cell_size = float(span.max()) / cells_per_axis or 1.0
+        self.shape = np.floor(span / self.cell_size).astype(np.intp) + 1
+        cells = self._cell_ids(self.positions)
+        # Refine the cell size for clustered data: aim for points_per_cell nodes in
+        # the cell of a typical node, keeping the grid to at most 8 cells per node
+        for _ in range(3):
+            crowding = np.sum(np.bincount(cells).astype(float) ** 2) / n
+            cell_size = self.cell_size * (self.points_per_cell / max(crowding, 1e-12)) ** (1 / self.dim)
+            shape = np.floor(span / cell_size).astype(np.intp) + 1
+            if cell_size >= self.cell_size or np.prod(shape.astype(float)) > 8 * n:
+                break
+            self.cell_size, self.shape = cell_size, shape
+            cells = self._cell_ids(self.positions)
+
+        self._order = np.argsort(cells, kind="stable")
+        self._cell_start = np.searchsorted(cells[self._order], np.arange(np.prod(self.shape) + 1))
+        self._stale = np.zeros(len(self.positions), dtype=bool)
+        self._moved = np.empty(0, dtype=np.intp)
+        if self.frequencies is not None:
+            self._freq_order = np.argsort(self.frequencies, kind="stable")
+            self._freq_sorted = self.frequencies[self._freq_order]
+
+    def _cell_coords(self, points):
+        coords = np.floor((points - self.lower) / self.cell_size).astype(np.intp)
+        return np.clip(coords, 0, self.shape - 1)
+
+    def _cell_ids(self, points):
+        return np.ravel_multi_index(self._cell_coords(points).T, self.shape)
+
+    def update(self, row, position=None, frequency=None):
+        """Move node `row` and/or change its frequency, keeping the index valid."""
+        if position is not None:
+            self.positions[row] = position
+            if not self._stale[row]:
+                self._stale[row] = True
+                self._moved = np.append(self._moved, row)
+        if frequency is not None:
+            if self.frequencies is None:
+                raise ValueError("index was built without frequencies")
+            at = np.flatnonzero(self._freq_order == row)[0]
+            order = np.delete(self._freq_order, at)
+            freqs = np.delete(self._freq_sorted, at)
+            insert = np.searchsorted(freqs, frequency, side="right")
+            self._freq_order = np.insert(order, insert, row)
+            self._freq_sorted = np.insert(freqs, insert, frequency)
+            self.frequencies[row] = frequency
+        if len(self._moved) > self.rebuild_fraction * len(self.positions):
+            self.rebuild()
+
+    # Frequency index
+
+    def frequency_band(self, low, high):
+        """
+        Rows with low <= frequency <= high, in increasing frequency.
+        With arrays of bounds, returns (rows, offsets): the rows of band i are
+        rows[offsets[i]:offsets[i + 1]].
+        """
+        if self.frequencies is None:
+            raise ValueError("index was built without frequencies")
+        start = np.searchsorted(self._freq_sorted, low, side="left")
+        stop = np.searchsorted(self._freq_sorted, high, side="right")
+        if np.ndim(start) == 0:
+            return self._freq_order[start:max(start, stop)]
+        counts = np.maximum(stop - start, 0)
+        return self._freq_order[_ranges(start, counts)], _offsets(counts)
+
+    def _band_mask(self, band):
+        if band is None:
+            return None
+        mask = np.zeros(len(self.positions), dtype=bool)
+        mask[self.frequency_band(*band)] = True
+        return mask
+
+    # Spatial queries
+
+    def _candidates(self, points, radius_cells, allowed):
+        """
+        (query, row) pairs for every indexed row within `radius_cells` cells of
+        each query, plus every moved row, restricted to `allowed` rows.
+        """
+        offsets = np.array(list(product(range(-radius_cells, radius_cells + 1), repeat=self.dim)))
+        coords = self._cell_coords(points)[:, None, :] + offsets
+        inside = np.all((coords >= 0) & (coords < self.shape), axis=2)
+        cells = np.ravel_multi_index(np.clip(coords, 0, self.shape - 1).transpose(2, 0, 1), self.shape)
+        starts = self._cell_start[cells]
+        counts = np.where(inside, self._cell_start[cells + 1] - starts, 0)
+        queries = np.repeat(np.repeat(np.arange(len(points)), offsets.shape[0]), counts.ravel())
+        rows = self._order[_ranges(starts.ravel(), counts.ravel())]
+        if len(self._moved):
+            # Moved rows sit in their old cells; drop those entries and check them directly
+            keep = ~self._stale[rows]
+            queries = np.concatenate([queries[keep], np.repeat(np.arange(len(points)), len(self._moved))])
+            rows = np.concatenate([rows[keep], np.tile(self._moved, len(points))])
+            order = np.argsort(queries, kind="stable")
+            queries, rows = queries[order], rows[order]
+        if allowed is not None:
+            keep = allowed[rows]
+            queries, rows = queries[keep], rows[keep]
+        return queries, rows
+
+    def _searched_distance(self, points, radius_cells):
+        """
+        Lower bound on the distance from each query to any node outside the
+        cube of cells searched around it. Grid edges count as unbounded, since
+        nodes beyond them are clipped into the edge cells.
+        """
+        coords = self._cell_coords(points)
+        low = coords - radius_cells
+        high = coords + radius_cells + 1
+        below = np.where(low > 0, points - (self.lower + low * self.cell_size), np.inf)
+        above = np.where(high < self.shape, self.lower + high * self.cell_size - points, np.inf)
+        return np.maximum(np.minimum(below, above).min(axis=1), 0)
+
+    def _all_candidates(self, points, allowed):
+        rows = np.arange(len(self.positions)) if allowed is None else np.flatnonzero(allowed)
+        return np.repeat(np.arange(len(points)), len(rows)), np.tile(rows, len(points))
+
+    def _covers_grid(self, radius_cells):
+        return (2 * radius_cells + 1) ** self.dim >= np.prod(self.shape)
+
+    def knn(self, points, k=1, band=None, block_size=4096):
+        """
+        The k nearest nodes to each of (Q, dim) query points, optionally only
+        among nodes with frequency in band=(low, high).
+        Returns (rows, distances) of shape (Q, k), nearest first; missing
+        neighbours are -1 with distance inf.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, self.dim)
+        allowed = self._band_mask(band)
+        rows = np.full((len(points), k), -1, dtype=np.intp)
+        dist = np.full((len(points), k), np.inf)
+        for start in range(0, len(points), block_size):
+            pending = np.arange(start, min(start + block_size, len(points)))
+            radius_cells = 1
+            while len(pending):
+                full = self._covers_grid(radius_cells)
+                query_points = points[pending]
+                if full:
+                    queries, cand = self._all_candidates(query_points, allowed)
+                else:
+                    queries, cand = self._candidates(query_points, radius_cells, allowed)
+                d2 = np.sum((self.positions[cand] - query_points[queries]) ** 2, axis=1)
+                block_rows, block_d2 = _smallest_k(queries, cand, d2, len(pending), k)
+                # Exact once the k-th neighbour is closer than any unsearched cell
+                done = full | (block_d2[:, -1] <= self._searched_distance(query_points, radius_cells) ** 2)
+                rows[pending[done]] = block_rows[done]
+                dist[pending[done]] = np.sqrt(block_d2[done])
+                pending = pending[~done]
+                radius_cells += 1
+        return rows, dist
+
+    def radius(self, points, r, band=None, block_size=4096):
+        """
+        All nodes within distance r of each of (Q, dim) query points, optionally
+        only among nodes with frequency in band=(low, high).
+        Returns (rows, distances, offsets): the neighbours of query i, nearest
+        first, are rows[offsets[i]:offsets[i + 1]].
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, self.dim)
+        allowed = self._band_mask(band)
+        radius_cells = int(r // self.cell_size) + 1
+        all_rows, all_dist, counts = [], [], np.zeros(len(points), dtype=np.intp)
+        for start in range(0, len(points), block_size):
+            query_points = points[start:start + block_size]
+            if self._covers_grid(radius_cells):
+                queries, cand = self._all_candidates(query_points, allowed)
+            else:
+                queries, cand = self._candidates(query_points, radius_cells, allowed)
+            d2 = np.sum((self.positions[cand] - query_points[queries]) ** 2, axis=1)
+            keep = d2 <= r * r
+            queries, cand, d2 = queries[keep], cand[keep], d2[keep]
+            order = np.lexsort((d2, queries))
+            all_rows.append(cand[order])
+            all_dist.append(np.sqrt(d2[order]))
+            counts[start:start + len(query_points)] = np.bincount(queries, minlength=len(query_points))
+        return np.concatenate(all_rows or [np.empty(0, np.intp)]), \
+            np.concatenate(all_dist or [np.empty(0)]), _offsets(counts)
+
+
+def _ranges(starts, counts):
+    """Concatenation of arange(s, s + c) for each start s and count c."""
+    total = counts.sum()
+    shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return shift + np.arange(total)
+
+def _offsets(counts):
+    return np.concatenate([[0], np.cumsum(counts)])
+
+def _smallest_k(queries, rows, d2, n_queries, k):
+    """
+    Per query, the k candidate rows with the smallest d2 (padded with -1 / inf).
+    `queries` must be sorted; candidates are laid out as a padded (query, rank)
+    matrix and reduced with argpartition.
+    """
+    first = np.searchsorted(queries, np.arange(n_queries + 1))
+    counts = np.diff(first)
+    width = max(int(counts.max(initial=0)), k)
+    rank = np.arange(len(queries)) - first[queries]
+    padded_d2 = np.full((n_queries, width), np.inf)
+    padded_rows = np.full((n_queries, width), -1, dtype=np.intp)
+    padded_d2[queries, rank] = d2
+    padded_rows[queries, rank] = rows
+    if width > k:
+        part = np.argpartition(padded_d2, k - 1, axis=1)[:, :k]
+        padded_d2 = np.take_along_axis(padded_d2, part, axis=1)
+        padded_rows = np.take_along_axis(padded_rows, part, axis=1)
+    order = np.argsort(padded_d2, axis=1, kind="stable")
+    return np.take_along_axis(padded_rows, order, axis=1), np.take_along_axis(padded_d2, order, axis=1)
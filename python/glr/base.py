@@ -27,3 +27,22 @@ class GLRCorrectorBase(ABC):
     def correct_frequency(self, frequencies: List[float], nrcis: List[float]) -> dict:
         """Apply frequency correction using NRCI-weighted error minimization."""
         pass
+
+def glr_word_errors(bitfield: np.ndarray) -> Tuple[int, int]:
+    """
+    Count 24-bit OffBit words that cannot be extended Golay codewords.
+    Every (24,12) Golay codeword is doubly even, so a word whose weight is not a multiple of 4
+    is off the Golay/Leech lattice. Trailing bits that do not fill a word are ignored.
+    Returns (error_words, total_words).
+    """
+    bits = np.asarray(bitfield).ravel()
+    n_words = len(bits) // 24
+    if n_words == 0:
+        return 0, 0
+    weights = np.count_nonzero(bits[:n_words * 24].reshape(n_words, 24), axis=1)
+    return int(np.count_nonzero(weights % 4)), n_words
+
+def glr_error(bitfield: np.ndarray) -> float:
+    """GLR error: fraction of 24-bit words in the bitfield that are not Golay codewords."""
+    errors, words = glr_word_errors(bitfield)
+    return errors / words if words else 0.0
@@ -2,6 +2,28 @@ import numpy as np
 import itertools
 
 class GLRErrorCorrector:
+    # Generator matrix for Golay (24,12) code
+    G = np.array([
+        [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0],
+        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0, 1],
+        [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1],
+        [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1],
+        [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 0, 1, 1, 0, 0, 1],
+        [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0, 1, 0, 1, 1, 0, 1, 0, 1],
+        [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 1, 1, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 0, 0, 1, 1, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 0, 0, 1, 1],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 1],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
+    ])
+
+    # Parity check matrix H = [P^T | I] matching the systematic generator
+    H = np.hstack([G[:, 12:].T, np.eye(12, dtype=int)])
+
+    # Syndrome -> error pattern lookup, built on first decode
+    _SYNDROMES = None
+
     def __init__(self):
         # Initialize Golay code parameters
         self.golay_n = 24
@@ -13,27 +35,11 @@ class GLRErrorCorrector:
         if len(data) != 12:
             raise ValueError("Input data must be 12 bits")
             
-        # Generator matrix for Golay (24,12) code
-        G = np.array([
-            [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-            [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0],
-            [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0, 1],
-            [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1],
-            [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1],
-            [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 0, 0, 1, 1, 0, 0, 1],
-            [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0, 1, 0, 1, 1, 0, 1, 0, 1],
-            [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, 1, 0, 0, 1, 1, 0, 1, 1, 1, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 1, 1, 1, 0, 0, 1, 1, 0],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 1, 0, 0, 1, 1],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 1],
-            [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1]
-        ])
-        
         # Convert input data to numpy array
         data_array = np.array(data)
         
         # Perform matrix multiplication to generate codeword
-        codeword = np.mod(np.dot(data_array, G), 2)
+        codeword = np.mod(np.dot(data_array, self.G), 2)
         
         return codeword.tolist()
         
@@ -42,57 +48,12 @@ class GLRErrorCorrector:
         if len(code) != 24:
             raise ValueError("Input code must be 24 bits")
             
-        # Parity check matrix for Golay (24,12) code
-        H = np.array([
-            [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [1, 1, 0, 1, 1, 1, 0, 0, 0, 1, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            [1, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-            [1, 1, 0, 0, 0, 1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-            [1, 0, 1, 1, 1, 0, 0, 1, 1, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
-            [1, 0, 1, 0, 1, 0, 1, 1, 0, 1, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            [1, 0, 1, 0, 0, 1, 1, 0, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
-            [1, 0, 0, 1, 1, 1, 1, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
-            [1, 0, 0, 1, 0, 1, 1, 1, 0, 0, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
-            [1, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-            [0, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1]
-        ])
-        
         # Convert code to numpy array
         code_array = np.array(code)
         
-        # Calculate syndrome
-        syndrome = np.mod(np.dot(H, code_array), 2)
-        
-        # Comprehensive error pattern lookup table
-        error_patterns = {
-            # Single bit errors
-            **{tuple([1 if i == j else 0 for j in range(12)]): 
-               [1 if i == j else 0 for j in range(24)] for i in range(12)},
-            
-            # Two bit errors
-            **{tuple([1 if i == j or i == k else 0 for j in range(12)]): 
-               [1 if i == j or i == k else 0 for j in range(24)] 
-               for i in range(12) for k in range(i+1, 12)},
-            
-            # Three bit errors
-            **{tuple([1 if i == j or i == k or i == l else 0 for j in range(12)]): 
-               [1 if i == j or i == k or i == l else 0 for j in range(24)] 
-               for i in range(12) for k in range(i+1, 12) for l in range(k+1, 12)},
-            
-            # Common burst error patterns
-            tuple([1,1,1,0,0,0,0,0,0,0,0,0]): [1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
-            tuple([0,0,0,1,1,1,0,0,0,0,0,0]): [0,0,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
-            tuple([0,0,0,0,0,0,1,1,1,0,0,0]): [0,0,0,0,0,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0],
-            tuple([0,0,0,0,0,0,0,0,0,1,1,1]): [0,0,0,0,0,0,0,0,0,1,1,1,0,0,0,0,0,0,0,0,0,0,0,0],
-            
-            # Common alternating patterns
-            tuple([1,0,1,0,1,0,1,0,1,0,1,0]): [1,0,1,0,1,0,1,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,0,0],
-            tuple([0,1,0,1,0,1,0,1,0,1,0,1]): [0,1,0,1,0,1,0,1,0,1,0,1,0,0,0,0,0,0,0,0,0,0,0,0]
-        }
-        
-        # Lookup error pattern
-        error = error_patterns.get(tuple(syndrome), None)
+        # Calculate syndrome and look up the matching error pattern
+        syndrome = np.mod(np.dot(self.H, code_array), 2)
+        error = self._syndrome_table().get(tuple(syndrome), None)
         
         if error is None:
             raise ValueError("Uncorrectable error pattern detected")
@@ -104,6 +65,26 @@ class GLRErrorCorrector:
         original_data = corrected_code[:12]
         
         return original_data.tolist()
+
+    @classmethod
+    def _syndrome_table(cls):
+        """Build the syndrome lookup table once and share it across instances"""
+        if cls._SYNDROMES is None:
+            # Up to three bit errors anywhere in the codeword, lowest weight wins
+            patterns = [()]
+            for weight in range(1, 4):
+                patterns.extend(itertools.combinations(range(24), weight))
+            # Common alternating error patterns in the data bits
+            patterns.extend([tuple(range(0, 12, 2)), tuple(range(1, 12, 2))])
+            errors = np.zeros((len(patterns), 24), dtype=int)
+            for row, positions in enumerate(patterns):
+                errors[row, list(positions)] = 1
+            syndromes = np.mod(errors @ cls.H.T, 2)
+            table = {}
+            for syndrome, error in zip(map(tuple, syndromes), errors):
+                table.setdefault(syndrome, error)
+            cls._SYNDROMES = table
+        return cls._SYNDROMES
         
     def find_leech_neighbors(self, vector):
         """Find neighbors in Leech lattice"""
@@ -126,31 +107,48 @@ class GLRErrorCorrector:
             
         return neighbors
         
-    def correct_frequencies(self, observed_freqs, target_freqs, nrcis):
-        """Correct frequencies using NRCI-weighted sums"""
-        if len(observed_freqs) != len(target_freqs) or len(observed_freqs) != len(nrcis):
+    def correct_frequencies(self, observed_freqs, target_freqs, nrcis, out=None):
+        """
+        Correct frequencies using NRCI-weighted sums.
+
+        Inputs are arrays of K frequencies, or (N, K) batches corrected row
+        by row; all three must have the same last axis length K, and leading
+        axes broadcast. NRCI weights are normalized along the last axis. The
+        result is written into `out` when a preallocated array is given,
+        which may be `observed_freqs` itself.
+        """
+        observed = np.asarray(observed_freqs, dtype=float)
+        target = np.asarray(target_freqs, dtype=float)
+        weights = np.asarray(nrcis, dtype=float)
+        if min(observed.ndim, target.ndim, weights.ndim) == 0 or \
+                not observed.shape[-1] == target.shape[-1] == weights.shape[-1]:
             raise ValueError("Input arrays must have same length")
+        try:
+            shape = np.broadcast_shapes(observed.shape, target.shape, weights.shape)
+        except ValueError:
+            raise ValueError("Input arrays must have same length") from None
             
         # Normalize NRCI weights
-        total_weight = sum(nrcis)
-        if total_weight == 0:
+        total_weight = weights.sum(axis=-1, keepdims=True)
+        if np.any(total_weight == 0):
             raise ValueError("NRCI weights cannot all be zero")
-        weights = [nrcis[i]/total_weight for i in range(len(nrcis))]
-        
-        # Calculate weighted correction
-        corrections = []
-        for i in range(len(observed_freqs)):
-            correction = weights[i] * (target_freqs[i] - observed_freqs[i])
-            corrections.append(correction)
             
-        # Apply corrections
-        corrected_freqs = [observed_freqs[i] + corrections[i] 
-                          for i in range(len(observed_freqs))]
+        # Apply weighted corrections: observed + w * (target - observed)
+        # The correction goes to a temporary first, so `out` may alias `observed`
+        correction = target - observed
+        correction *= weights
+        correction /= total_weight
+        if out is None:
+            out = np.empty(shape)
+        np.add(observed, correction, out=out)
         
-        return corrected_freqs
+        return out
         
     def process_data(self, input_data):
-        """Main processing pipeline"""
+        """
+        Main processing pipeline.
+        An optional 'out' array in input_data receives the corrected frequencies.
+        """
         # Step 1: Encode data with Golay code
         encoded_data = self.golay_encode(input_data['data'])
         
@@ -161,7 +159,8 @@ class GLRErrorCorrector:
         corrected_freqs = self.correct_frequencies(
             input_data['observed_freqs'],
             input_data['target_freqs'],
-            input_data['nrcis']
+            input_data['nrcis'],
+            out=input_data.get('out')
         )
         
         # Step 4: Decode with error correction
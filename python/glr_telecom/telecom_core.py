@@ -1,16 +1,95 @@
+import time
+from collections import deque
 import numpy as np
 from glr_core import GLRErrorCorrector
 
+# Frames whose corrected frequencies share one preallocated output block
+RESULT_BLOCK_FRAMES = 256
+
+class StreamStats:
+    """Running latency and throughput statistics for a framed IQ stream"""
+    def __init__(self, sample_rate, window=1024):
+        self.sample_rate = sample_rate
+        self.frames = 0
+        self.samples = 0
+        self.start_time = None
+        self.elapsed = 0.0
+        self.max_latency = 0.0
+        self._latency_sum = 0.0
+        # Only the most recent latencies are kept so memory stays bounded
+        self.latencies = deque(maxlen=window)
+
+    def record(self, n_samples, latency):
+        """Record one processed frame"""
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now - latency
+        self.elapsed = now - self.start_time
+        self.frames += 1
+        self.samples += n_samples
+        self._latency_sum += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.latencies.append(latency)
+
+    @property
+    def mean_latency(self):
+        return self._latency_sum / self.frames if self.frames else 0.0
+
+    @property
+    def samples_per_sec(self):
+        """Sustained throughput over the wall-clock life of the stream"""
+        return self.samples / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def realtime_factor(self):
+        """Throughput relative to the sample rate the stream must keep up with"""
+        return self.samples_per_sec / self.sample_rate
+
+    @property
+    def keeps_up(self):
+        return self.realtime_factor >= 1.0
+
+    def summary(self):
+        """Return the statistics as a plain dictionary"""
+        return {
+            'frames': self.frames,
+            'samples': self.samples,
+            'elapsed_s': self.elapsed,
+            'samples_per_sec': self.samples_per_sec,
+            'mean_latency_s': self.mean_latency,
+            'max_latency_s': self.max_latency,
+            'realtime_factor': self.realtime_factor,
+            'keeps_up': self.keeps_up
+        }
+
 class TelecomProcessor:
+    _NRCI_SCALES = np.array([30.0, 20.0, 30.0])
+    _NRCI_FLOORS = np.array([0.7, 0.9, 0.7])
+
     def __init__(self):
         self.glr = GLRErrorCorrector()
         # 5G NR parameters
         self.subcarrier_spacing = 15e3  # 15 kHz
         self.max_bw = 400e6  # 400 MHz
         self.max_scs = 3300  # Maximum subcarriers
+        self.fft_size = 4096  # OFDM symbol length covering max_scs subcarriers
+        self.stream_stats = None  # Statistics of the last streamed signal
         
-    def process_5g_signal(self, iq_samples):
-        """Process 5G NR signal with UBP error correction"""
+    @property
+    def subcarrier_spacing(self):
+        return self._subcarrier_spacing
+
+    @subcarrier_spacing.setter
+    def subcarrier_spacing(self, value):
+        self._subcarrier_spacing = value
+        self._freq_axes = {}  # FFT frequency axes keyed by frame length, for this spacing
+        self._target_freqs = None
+        
+    def process_5g_signal(self, iq_samples, out=None):
+        """
+        Process 5G NR signal with UBP error correction.
+        Corrected frequencies are written into `out` when an array is given.
+        """
         # Convert IQ samples to binary format
         binary_data = self._iq_to_binary(iq_samples)
         
@@ -19,38 +98,150 @@ class TelecomProcessor:
             'data': binary_data,
             'observed_freqs': self._estimate_frequencies(iq_samples),
             'target_freqs': self._get_target_frequencies(),
-            'nrcis': self._calculate_nrcis(iq_samples)
+            'nrcis': self._calculate_nrcis(iq_samples),
+            'out': out
         })
         
         return corrected_samples
+
+    def process_5g_stream(self, source, frame_size=None):
+        """
+        Process a 5G NR IQ stream frame by frame with UBP error correction.
+
+        `source` is an IQ array or any iterable of IQ chunks (a generator,
+        a ring buffer reader, ...). Chunks are regrouped into frames of
+        `frame_size` samples (one OFDM symbol by default) and each frame is
+        run through process_5g_signal. Only one frame is buffered, so memory
+        stays bounded however long the stream is. Results are yielded per
+        frame; latency and throughput are tracked in self.stream_stats.
+
+        Every frame is complex and exactly `frame_size` long, so results do not
+        depend on how the stream is chunked. A trailing partial frame is
+        zero-padded to `frame_size`; stream_stats counts only its real samples.
+        """
+        frame_size = frame_size or self.fft_size
+        self.stream_stats = StreamStats(self.max_bw)
+        n_freqs = len(self._get_target_frequencies())
+
+        for index, (frame, n_samples) in enumerate(self._iter_frames(source, frame_size)):
+            # Corrected frequencies go into rows of a preallocated block; a new block is
+            # started when one is full, so results already yielded never share memory
+            if index % RESULT_BLOCK_FRAMES == 0:
+                freq_block = np.empty((RESULT_BLOCK_FRAMES, n_freqs))
+            start = time.perf_counter()
+            result = self.process_5g_signal(frame, out=freq_block[index % RESULT_BLOCK_FRAMES])
+            latency = time.perf_counter() - start
+            self.stream_stats.record(n_samples, latency)
+            result['frame_index'] = index
+            result['latency'] = latency
+            yield result
+
+    def _iter_frames(self, source, frame_size):
+        """Regroup IQ chunks into complex frames of frame_size samples, yielding (frame, real samples)"""
+        if isinstance(source, np.ndarray):
+            source = (source,)
+
+        buffer = np.empty(frame_size, dtype=complex)
+        filled = 0
+        for chunk in source:
+            chunk = np.asarray(chunk, dtype=complex).ravel()
+            pos = 0
+            while pos < len(chunk):
+                # Whole frames inside an aligned chunk are passed through without a copy
+                if filled == 0 and len(chunk) - pos >= frame_size:
+                    yield chunk[pos:pos + frame_size], frame_size
+                    pos += frame_size
+                    continue
+                n = min(frame_size - filled, len(chunk) - pos)
+                buffer[filled:filled + n] = chunk[pos:pos + n]
+                filled += n
+                pos += n
+                if filled == frame_size:
+                    yield buffer, frame_size
+                    filled = 0
+
+        # Trailing partial frame at the end of the stream, zero-padded
+        if filled:
+            buffer[filled:] = 0
+            yield buffer, filled
         
-    def _estimate_frequencies(self, iq_samples):
-        """Estimate frequencies from IQ samples"""
+    def _estimate_frequencies(self, iq_samples, k=3, interpolate=False):
+        """
+        Estimate the k dominant frequencies from IQ samples.
+
+        Accepts a single signal or a (frames, samples) batch, transformed
+        along the last axis (rfft for real input, fft otherwise). Spectral
+        magnitudes are computed once and the top k bins selected with
+        argpartition, strongest first. With `interpolate`, each peak is
+        refined to sub-bin accuracy by fitting a parabola through it and its
+        two neighbours on the log spectrum. Returns a (k,) array for 1-D input, a (frames, k)
+        array for batched input.
+        """
         # Convert to numpy array
-        iq_array = np.array(iq_samples)
+        iq_array = np.asarray(iq_samples)
+        n = iq_array.shape[-1]
+        real = not np.iscomplexobj(iq_array)
         
         # Perform FFT to get frequency components
-        fft_result = np.fft.fft(iq_array)
-        freqs = np.fft.fftfreq(len(iq_array), d=1/self.subcarrier_spacing)
+        fft_result = np.fft.rfft(iq_array, axis=-1) if real else np.fft.fft(iq_array, axis=-1)
+        magnitudes = np.abs(fft_result)
+        freqs = self._frequency_axis(n, real)
+        
+        # Select the top k bins, ordered by decreasing magnitude
+        k = min(k, magnitudes.shape[-1])
+        top = np.argpartition(magnitudes, -k, axis=-1)[..., -k:]
+        order = np.argsort(-np.take_along_axis(magnitudes, top, axis=-1), axis=-1, kind='stable')
+        peaks = np.take_along_axis(top, order, axis=-1)
+        dominant_freqs = freqs[peaks]
         
-        # Get dominant frequencies
-        dominant_freqs = []
-        for i in range(min(3, len(freqs))):  # Get top 3 frequencies
-            idx = np.argmax(np.abs(fft_result))
-            dominant_freqs.append(freqs[idx])
-            fft_result[idx] = 0  # Remove this frequency for next iteration
+        if interpolate and magnitudes.shape[-1] > 2:
+            dominant_freqs = dominant_freqs + self._peak_offsets(magnitudes, peaks, real) * self.subcarrier_spacing / n
             
         return dominant_freqs
+
+    def _frequency_axis(self, n, real=False):
+        """FFT frequency axis for an n-sample frame, cached per frame length"""
+        key = (n, real)
+        if key not in self._freq_axes:
+            d = 1 / self.subcarrier_spacing
+            self._freq_axes[key] = np.fft.rfftfreq(n, d=d) if real else np.fft.fftfreq(n, d=d)
+        return self._freq_axes[key]
+
+    def _peak_offsets(self, magnitudes, peaks, real):
+        """Parabolic sub-bin offsets (in bins) of spectral peaks"""
+        n_bins = magnitudes.shape[-1]
+        if real:
+            # One-sided spectrum: edge bins have no outer neighbour
+            left = np.clip(peaks - 1, 0, n_bins - 1)
+            right = np.clip(peaks + 1, 0, n_bins - 1)
+        else:
+            # Full spectrum wraps around
+            left = (peaks - 1) % n_bins
+            right = (peaks + 1) % n_bins
+        # Fit on the log spectrum, which is closer to parabolic around a peak
+        log_mag = np.log(np.maximum(magnitudes, np.finfo(float).tiny))
+        a = np.take_along_axis(log_mag, left, axis=-1)
+        b = np.take_along_axis(log_mag, peaks, axis=-1)
+        c = np.take_along_axis(log_mag, right, axis=-1)
+        denom = a - 2 * b + c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            offsets = np.where(denom != 0, 0.5 * (a - c) / denom, 0.0)
+        # Peaks on the edge of a one-sided spectrum are left unrefined
+        offsets[(left == peaks) | (right == peaks)] = 0.0
+        return np.clip(offsets, -0.5, 0.5)
         
     def _get_target_frequencies(self):
-        """Get target frequencies based on 5G NR configuration"""
-        # For initial implementation, use center frequency and ±1 subcarrier
-        center_freq = 0  # Baseband center
-        return [
-            center_freq - self.subcarrier_spacing,
-            center_freq,
-            center_freq + self.subcarrier_spacing
-        ]
+        """Get target frequencies based on 5G NR configuration (a read-only array, cached)"""
+        if self._target_freqs is None:
+            # For initial implementation, use center frequency and ±1 subcarrier
+            center_freq = 0  # Baseband center
+            self._target_freqs = np.array([
+                center_freq - self.subcarrier_spacing,
+                center_freq,
+                center_freq + self.subcarrier_spacing
+            ])
+            self._target_freqs.flags.writeable = False
+        return self._target_freqs
         
     def _iq_to_binary(self, iq_samples):
         """Convert IQ samples to 12-bit binary format"""
@@ -82,10 +273,5 @@ class TelecomProcessor:
         
         # Simple NRCI calculation (will be enhanced with UBP-specific metrics)
         snr = 10 * np.log10(signal_power/noise_power) if noise_power > 0 else 30
-        nrcis = [
-            min(1.0, max(0.7, snr/30)),  # Lower frequency
-            min(1.0, max(0.9, snr/20)),  # Center frequency
-            min(1.0, max(0.7, snr/30))   # Higher frequency
-        ]
-        
-        return nrcis
\ No newline at end of file
+        # Lower, center and higher frequency: snr / scale clipped to [floor, 1]
+        return np.clip(snr / self._NRCI_SCALES, self._NRCI_FLOORS, 1.0)
\ No newline at end of file
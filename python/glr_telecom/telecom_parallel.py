@@ -0,0 +1,108 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from telecom_core import TelecomProcessor, StreamStats
+
+# Per-worker processor, created once when the worker starts
+_worker_processor = None
+
+def _init_worker(config):
+    """Build the worker's processor with the parent's configuration"""
+    global _worker_processor
+    _worker_processor = TelecomProcessor()
+    for name, value in config.items():
+        setattr(_worker_processor, name, value)
+
+def _attach(name):
+    """Attach to an existing shared memory block without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name=name)
+
+def _process_batch(shm_name, n_samples, start, stop, frame_size, first_frame):
+    """Process samples [start, stop) of a shared IQ capture in one worker"""
+    shm = _attach(shm_name)
+    try:
+        iq_array = np.ndarray((n_samples,), dtype=complex, buffer=shm.buf)
+        results = list(_worker_processor.process_5g_stream(iq_array[start:stop], frame_size))
+        del iq_array
+    finally:
+        shm.close()
+    for result in results:
+        result['frame_index'] += first_frame
+    return results
+
+class ParallelTelecomProcessor:
+    """
+    Multi-core executor around TelecomProcessor.
+
+    A capture is copied once into a shared memory block, split into batches
+    of whole frames and processed on a pool of worker processes. Workers read
+    their frames straight from shared memory, so only the small per-frame
+    results are pickled. Results come back in frame order.
+    `subcarrier_spacing` and `max_bw` configure the workers' processors.
+    """
+    def __init__(self, workers=None, frame_size=4096, frames_per_batch=64,
+                 subcarrier_spacing=15e3, max_bw=400e6):
+        self.workers = workers or os.cpu_count() or 1
+        self.frame_size = frame_size
+        self.frames_per_batch = frames_per_batch
+        self.config = {'subcarrier_spacing': subcarrier_spacing, 'max_bw': max_bw}
+        self.max_bw = max_bw
+        self.stream_stats = None  # Statistics of the last processed capture
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def process_capture(self, iq_samples):
+        """Process a full IQ capture in parallel and return per-frame results in order"""
+        iq_array = np.ascontiguousarray(iq_samples, dtype=complex).ravel()
+        n_samples = len(iq_array)
+        if n_samples == 0:
+            return []
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.config,))
+
+        self.stream_stats = StreamStats(self.max_bw)
+        self.stream_stats.start_time = time.perf_counter()
+
+        shm = shared_memory.SharedMemory(create=True, size=iq_array.nbytes)
+        try:
+            shared = np.ndarray(iq_array.shape, dtype=complex, buffer=shm.buf)
+            shared[:] = iq_array
+            del shared
+
+            batch_samples = self.frame_size * self.frames_per_batch
+            futures = [
+                self._pool.submit(_process_batch, shm.name, n_samples, start,
+                                  min(start + batch_samples, n_samples),
+                                  self.frame_size, start // self.frame_size)
+                for start in range(0, n_samples, batch_samples)
+            ]
+
+            results = []
+            for future in futures:
+                for result in future.result():
+                    n = min(self.frame_size, n_samples - result['frame_index'] * self.frame_size)
+                    self.stream_stats.record(n, result['latency'])
+                    results.append(result)
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return results
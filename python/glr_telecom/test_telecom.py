@@ -1,4 +1,7 @@
+from glr_core import GLRErrorCorrector
 from telecom_core import TelecomProcessor
+from telecom_parallel import ParallelTelecomProcessor
+from benchmark import generate_ofdm_symbols, run_benchmark
 import numpy as np
 
 def test_telecom():
@@ -19,7 +22,147 @@ def test_telecom():
     
     # Print results
     print("Original Signal Power:", np.mean(np.abs(noisy_samples)**2))
-    print("Corrected Signal Power:", np.mean(np.abs(corrected_samples)**2))
+    print("Corrected Frequencies:", corrected_samples['corrected_freqs'])
+    assert corrected_samples['decoded_data'] == processor._iq_to_binary(noisy_samples)
+
+def test_telecom_stream():
+    processor = TelecomProcessor()
+    
+    # Stream a noisy tone in chunks that do not line up with the frame size
+    t = np.arange(10000)
+    iq_samples = np.exp(1j * 2 * np.pi * 0.05 * t)
+    chunks = (iq_samples[i:i + 1500] for i in range(0, len(iq_samples), 1500))
+    
+    results = list(processor.process_5g_stream(chunks, frame_size=1024))
+    
+    assert len(results) == 10  # 9 full frames plus a trailing partial frame
+    assert [r['frame_index'] for r in results] == list(range(10))
+    assert all(len(r['corrected_freqs']) == 3 for r in results)
+    # Per-frame outputs are arrays written in place, never overwritten by later frames
+    assert isinstance(results[0]['corrected_freqs'], np.ndarray)
+    assert not np.shares_memory(results[0]['corrected_freqs'], results[1]['corrected_freqs'])
+    stats = processor.stream_stats.summary()
+    assert stats['frames'] == 10
+    assert stats['samples'] == 10000
+    assert stats['samples_per_sec'] > 0
+    
+    # A short tail is zero-padded, and chunking does not change real-valued results
+    tail = list(processor.process_5g_stream(np.exp(1j * 0.05 * np.arange(1026)), 1024))
+    assert len(tail) == 2 and processor.stream_stats.samples == 1026
+    real = np.cos(0.05 * t)
+    whole = list(processor.process_5g_stream(real, frame_size=1024))
+    chunked = list(processor.process_5g_stream((real[i:i + 700] for i in range(0, len(real), 700)), 1024))
+    for a, b in zip(whole, chunked):
+        assert np.array_equal(a['corrected_freqs'], b['corrected_freqs'])
+
+def test_estimate_frequencies_top_k():
+    processor = TelecomProcessor()
+    fs = processor.subcarrier_spacing
+    t = np.arange(1000) / fs
+    iq_samples = (np.exp(2j * np.pi * 1500 * t)
+                  + 0.5 * np.exp(2j * np.pi * -3000 * t)
+                  + 0.25 * np.exp(2j * np.pi * 4500 * t))
+    
+    assert np.array_equal(processor._estimate_frequencies(iq_samples), [1500.0, -3000.0, 4500.0])
+    
+    # Batched frames give one row of estimates per frame
+    batch = np.stack([iq_samples, iq_samples[::-1].conj()])
+    freqs = processor._estimate_frequencies(batch, k=2)
+    assert freqs.shape == (2, 2)
+    assert np.allclose(freqs[0], [1500.0, -3000.0])
+    
+    # Parabolic interpolation moves an off-bin tone estimate towards the truth
+    off_bin = np.exp(2j * np.pi * 1507.0 * t)
+    coarse = processor._estimate_frequencies(off_bin, k=1)[0]
+    fine = processor._estimate_frequencies(off_bin, k=1, interpolate=True)[0]
+    assert abs(fine - 1507.0) < abs(coarse - 1507.0)
+
+def test_frequency_axis_follows_subcarrier_spacing():
+    processor = TelecomProcessor()
+    t = np.arange(1000) / processor.subcarrier_spacing
+    tone = np.exp(2j * np.pi * 1500 * t)
+    assert np.array_equal(processor._estimate_frequencies(tone, k=1), [1500.0])
+    
+    # The same samples read at twice the spacing put the tone at twice the frequency
+    processor.subcarrier_spacing = 30e3
+    fresh = TelecomProcessor()
+    fresh.subcarrier_spacing = 30e3
+    assert np.array_equal(processor._estimate_frequencies(tone, k=1), [3000.0])
+    assert np.array_equal(fresh._estimate_frequencies(tone, k=1), [3000.0])
+
+def test_parallel_matches_sequential():
+    t = np.arange(20000)
+    iq_samples = np.exp(1j * 2 * np.pi * 0.05 * t)
+    
+    sequential = list(TelecomProcessor().process_5g_stream(iq_samples, frame_size=1024))
+    with ParallelTelecomProcessor(workers=2, frame_size=1024, frames_per_batch=4) as processor:
+        parallel = processor.process_capture(iq_samples)
+    
+    assert [r['frame_index'] for r in parallel] == list(range(len(sequential)))
+    for seq, par in zip(sequential, parallel):
+        assert np.array_equal(seq['corrected_freqs'], par['corrected_freqs'])
+        assert seq['decoded_data'] == par['decoded_data']
+    assert processor.stream_stats.samples == len(iq_samples)
+
+def test_parallel_workers_use_processor_config():
+    t = np.arange(8192)
+    iq_samples = np.exp(1j * 2 * np.pi * 0.05 * t)
+    
+    sequential = TelecomProcessor()
+    sequential.subcarrier_spacing = 30e3
+    expected = list(sequential.process_5g_stream(iq_samples, frame_size=1024))
+    with ParallelTelecomProcessor(workers=2, frame_size=1024, frames_per_batch=4,
+                                  subcarrier_spacing=30e3, max_bw=100e6) as processor:
+        parallel = processor.process_capture(iq_samples)
+    
+    default = list(TelecomProcessor().process_5g_stream(iq_samples, frame_size=1024))
+    assert not np.array_equal(default[0]['corrected_freqs'], parallel[0]['corrected_freqs'])
+    for seq, par in zip(expected, parallel):
+        assert np.array_equal(seq['corrected_freqs'], par['corrected_freqs'])
+    assert processor.stream_stats.sample_rate == 100e6
+
+def test_benchmark_report():
+    # The synthetic workload is reproducible under a seed
+    first = np.concatenate(list(generate_ofdm_symbols(4, bandwidth=5e6, seed=7)))
+    second = np.concatenate(list(generate_ofdm_symbols(4, bandwidth=5e6, seed=7)))
+    assert np.array_equal(first, second)
+    
+    report = run_benchmark(bandwidth=5e6, frames=8)
+    assert report['config']['fft_size'] == 512
+    assert report['samples_per_sec'] > 0
+    assert report['codewords_per_sec'] > 0
+    assert report['latency_p50_ms'] <= report['latency_p99_ms']
+
+def test_correct_frequencies_batch():
+    glr = GLRErrorCorrector()
+    observed = np.array([[-15100.0, 40.0, 14900.0], [-14950.0, -25.0, 15050.0]])
+    target = np.array([-15e3, 0.0, 15e3])
+    nrcis = np.array([[0.7, 0.9, 0.7], [1.0, 1.0, 1.0]])
+    
+    # Batched rows match row-by-row correction
+    out = np.empty_like(observed)
+    corrected = glr.correct_frequencies(observed, target, nrcis, out=out)
+    assert corrected is out
+    for row in range(2):
+        expected = glr.correct_frequencies(observed[row], target, nrcis[row])
+        assert np.allclose(corrected[row], expected)
+    
+    weights = nrcis[1] / nrcis[1].sum()
+    assert np.allclose(corrected[1], observed[1] + weights * (target - observed[1]))
+    
+    # In place on the observed frequencies
+    freqs = np.array([1.0, 2.0, 3.0])
+    assert glr.correct_frequencies(freqs, [2.0, 2.0, 2.0], [1.0, 1.0, 2.0], out=freqs) is freqs
+    assert np.allclose(freqs, [1.25, 2.0, 2.5])
+    
+    # The frequency axis must match; only leading (batch) axes broadcast
+    for bad in ([1.0], [1.0, 2.0]):
+        try:
+            glr.correct_frequencies(bad, target, nrcis[0])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("mismatched lengths accepted")
 
 if __name__ == "__main__":
     test_telecom()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import math
 import numpy as np
+from python.noise.bitfield import popcount
 
 class HGR:
     """
@@ -13,6 +14,13 @@ class HGR:
         144, 233, 377, 610, 987, 1597, 2584, 4181,
         6765, 10946, 17711, 28657
     ])
+
+    # Integer-coded lookup tables for the array variants. The extra last
+    # entry holds the default used for unknown names.
+    GEOMETRY_TYPES = ('sphere', 'torus', 'tetrahedron', 'random_sphere')
+    GEOMETRY_OFFSETS = np.array([1.0, 1.33, 1.71, 1.01, 1.0])
+    REALMS = ('quantum', 'electromagnetic', 'gravitational', 'biological', 'cosmological', 'cross_realm')
+    REALM_FREQUENCIES = np.array([1e12, 1e14, 1e-12, 1e13, 1e-15, 5.8e14, 1e12])
     
     @staticmethod
     def ofbit_encode(value: float) -> np.ndarray:
@@ -27,6 +35,68 @@ class HGR:
         bits = (modded > (2**23)).astype(int)
         return bits
 
+    # Weight of each OFBIT position in a packed word: bit i holds FIBS_24[i]
+    OFBIT_WEIGHTS = (np.uint32(1) << np.arange(24, dtype=np.uint32))
+
+    @staticmethod
+    def ofbit_encode_batch(values: np.ndarray, precision: str = 'float64', block_size: int = 1 << 16) -> np.ndarray:
+        """
+        Array variant of ofbit_encode that packs the 24 bits of each value into one uint32
+        (bit i is OFBIT position i). Values are processed in blocks of block_size.
+        With precision='float32' the products are thresholded in float32, halving the
+        temporary memory per block; values with a bit too close to the threshold or wrap
+        point for float32 to resolve are recomputed in float64. Either way the result is
+        identical to ofbit_encode.
+        """
+        if precision not in ('float64', 'float32'):
+            raise ValueError("precision must be 'float64' or 'float32'")
+        values = np.asarray(values, dtype=np.float64)
+        flat = values.reshape(-1)
+        packed = np.empty(len(flat), dtype=np.uint32)
+        for start in range(0, len(flat), block_size):
+            block = flat[start:start + block_size]
+            bits = HGR._ofbit_bits(block, float32=(precision == 'float32'))
+            packed[start:start + len(block)] = bits.astype(np.uint32) @ HGR.OFBIT_WEIGHTS
+        return packed.reshape(values.shape)
+
+    @staticmethod
+    def _ofbit_bits(values: np.ndarray, float32: bool = False) -> np.ndarray:
+        """
+        (N, 24) boolean OFBIT bits for a block of float64 values.
+        mod(v * F, 2^24) > 2^23 is evaluated as frac(v * F / 2^24) > 0.5, which is exact
+        (power-of-two scaling) and avoids the slower floating-point modulo.
+        """
+        if not float32:
+            x = values[:, None] * (HGR.FIBS_24 * 2.0**-24)
+            return (x - np.floor(x)) > 0.5
+        # FIBS_24[0] is 0, so bit 0 is always clear
+        bits = np.zeros((len(values), 24), dtype=bool)
+        # Values that overflow float32 are caught below and recomputed
+        with np.errstate(over='ignore', invalid='ignore'):
+            v32 = values.astype(np.float32)
+            x = v32[:, None] * (HGR.FIBS_24[1:] * 2.0**-24).astype(np.float32)
+            frac = x - np.floor(x)
+        bits[:, 1:] = frac > 0.5
+        # float32 rounding moves frac by at most |v| * 28657 * 2^-47. Rows with a bit that
+        # close to the threshold (frac = 0.5) or the wrap point (frac = 0/1), or whose
+        # magnitude float32 cannot represent well, are recomputed in float64.
+        error = np.abs(v32) * np.float32(HGR.FIBS_24[-1] * 2.0**-46)
+        distance = np.abs(frac - np.float32(0.5))
+        unsafe = np.any((distance < error[:, None]) | (distance > (0.5 - error)[:, None]), axis=1)
+        magnitude = np.abs(values)
+        unsafe |= (magnitude != 0) & ((magnitude < 2.0**-60) | (magnitude > 2.0**60))
+        if np.any(unsafe):
+            bits[unsafe] = HGR._ofbit_bits(values[unsafe])
+        return bits
+
+    @staticmethod
+    def ofbit_decode(packed) -> np.ndarray:
+        """
+        Unpack uint32 OFBIT words into (..., 24) int bit arrays, as returned by ofbit_encode.
+        """
+        packed = np.asarray(packed, dtype=np.uint32)
+        return ((packed[..., None] & HGR.OFBIT_WEIGHTS) != 0).astype(int)
+
     @staticmethod
     def crv_from_geometry(geometry_type: str, coords: np.ndarray) -> float:
         """
@@ -34,13 +104,8 @@ class HGR:
         Placeholder: real implementation would use domain-specific formulas.
         """
         # For demo: use the norm of the coordinates plus a geometry-type offset
-        offsets = {
-            'sphere': 1.0,
-            'torus': 1.33,
-            'tetrahedron': 1.71,
-            'random_sphere': 1.01
-        }
-        offset = offsets.get(geometry_type, 1.0)
+        offsets = dict(zip(HGR.GEOMETRY_TYPES, HGR.GEOMETRY_OFFSETS))
+        offset = offsets.get(geometry_type, HGR.GEOMETRY_OFFSETS[-1])
         return offset + 0.01 * np.linalg.norm(coords)
 
     @staticmethod
@@ -64,15 +129,92 @@ class HGR:
         """
         Map CRV to a resonance frequency (Hz) based on realm.
         """
-        # Example values for demonstration
-        realm_freqs = {
-            'quantum': 1e12,
-            'electromagnetic': 1e14,
-            'gravitational': 1e-12,
-            'biological': 1e13,
-            'cosmological': 1e-15,
-            'cross_realm': 5.8e14  # Golden wavelength region
-        }
-        base_freq = realm_freqs.get(realm, 1e12)
+        # Example values for demonstration (cross_realm: golden wavelength region)
+        realm_freqs = dict(zip(HGR.REALMS, HGR.REALM_FREQUENCIES))
+        base_freq = realm_freqs.get(realm, HGR.REALM_FREQUENCIES[-1])
         # Scale by CRV for demonstration
         return base_freq * crv
+
+    @staticmethod
+    def geometry_codes(geometry_types) -> np.ndarray:
+        """
+        Map geometry type names to integer codes (index into GEOMETRY_TYPES).
+        Unknown names get the default code len(GEOMETRY_TYPES).
+        """
+        return HGR._encode(geometry_types, HGR.GEOMETRY_TYPES)
+
+    @staticmethod
+    def realm_codes(realms) -> np.ndarray:
+        """
+        Map realm names to integer codes (index into REALMS).
+        Unknown names get the default code len(REALMS).
+        """
+        return HGR._encode(realms, HGR.REALMS)
+
+    @staticmethod
+    def _encode(names, vocabulary) -> np.ndarray:
+        names = np.asarray(names)
+        if names.dtype.kind in 'iu':
+            return names
+        unique, inverse = np.unique(names, return_inverse=True)
+        lookup = np.array([vocabulary.index(n) if n in vocabulary else len(vocabulary) for n in unique.tolist()],
+                          dtype=np.intp)
+        return lookup[inverse].reshape(names.shape)
+
+    @staticmethod
+    def crv_from_geometry_batch(geometry_types, coords: np.ndarray) -> np.ndarray:
+        """
+        Array variant of crv_from_geometry for (N, 3) coordinates.
+        geometry_types is a name, an (N,) array of names or an (N,) array of geometry codes.
+        """
+        offsets = HGR.GEOMETRY_OFFSETS[HGR.geometry_codes(geometry_types)]
+        return offsets + 0.01 * np.linalg.norm(np.asarray(coords, dtype=float), axis=-1)
+
+    @staticmethod
+    def calculate_stability_batch(crv: np.ndarray) -> np.ndarray:
+        """
+        Array variant of calculate_stability.
+        """
+        return 1 - np.abs(np.sin(np.pi * np.asarray(crv, dtype=float)))
+
+    @staticmethod
+    def assign_frequency_batch(crv: np.ndarray, realms) -> np.ndarray:
+        """
+        Array variant of assign_frequency.
+        realms is a name, an (N,) array of names or an (N,) array of realm codes.
+        """
+        return HGR.REALM_FREQUENCIES[HGR.realm_codes(realms)] * np.asarray(crv, dtype=float)
+
+
+class OFBITWords:
+    """
+    Read-only view over packed OFBIT words (one uint32 per value, from
+    HGR.ofbit_encode_batch). Bits are unpacked only for the rows or
+    positions that are accessed.
+    """
+
+    def __init__(self, words: np.ndarray):
+        self.words = np.asarray(words, dtype=np.uint32).reshape(-1)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, index) -> np.ndarray:
+        """24-bit vector(s) of the selected word(s)."""
+        return HGR.ofbit_decode(self.words[index])
+
+    def __iter__(self):
+        for word in self.words:
+            yield HGR.ofbit_decode(word)
+
+    def __array__(self, dtype=None, copy=None):
+        bits = HGR.ofbit_decode(self.words)
+        return bits if dtype is None else bits.astype(dtype)
+
+    def position(self, i: int) -> np.ndarray:
+        """OFBIT position i of every word as a 0/1 array."""
+        return ((self.words >> np.uint32(i)) & np.uint32(1)).astype(np.uint8)
+
+    def popcount(self) -> np.ndarray:
+        """Number of set bits in each word."""
+        return popcount(self.words).astype(int)
@@ -1,42 +1,103 @@
 import numpy as np
 
-def generate_sphere_points(n_vertices: int) -> np.ndarray:
+# Points generated per block by the chunked iterators
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+GOLDEN_RATIO = (1 + 5**0.5) / 2
+
+TETRAHEDRON_VERTICES = np.array([
+    [1, 1, 1],
+    [-1, -1, 1],
+    [-1, 1, -1],
+    [1, -1, -1]
+])
+
+def _chunk_bounds(n_points: int, chunk_size: int):
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    for start in range(0, n_points, chunk_size):
+        yield start, min(start + chunk_size, n_points)
+
+def _sphere_lattice(indices: np.ndarray, n_vertices: int, dtype) -> np.ndarray:
+    indices = indices + 0.5
+    phi = np.arccos(1 - 2*indices/n_vertices)
+    theta = np.pi * (1 + 5**0.5) * indices
+
+    points = np.empty((len(indices), 3), dtype=dtype)
+    points[:, 0] = np.cos(theta) * np.sin(phi)
+    points[:, 1] = np.sin(theta) * np.sin(phi)
+    points[:, 2] = np.cos(phi)
+    return points
+
+def _torus_lattice(indices: np.ndarray, n_vertices: int, R: float, r: float, dtype) -> np.ndarray:
+    # Fibonacci lattice on the torus: theta steps evenly around the ring while phi
+    # advances by the golden ratio, so the points cover the whole surface
+    theta = 2*np.pi * indices / n_vertices
+    phi = 2*np.pi * np.mod(indices / GOLDEN_RATIO, 1.0)
+
+    points = np.empty((len(indices), 3), dtype=dtype)
+    points[:, 0] = (R + r*np.cos(phi)) * np.cos(theta)
+    points[:, 1] = (R + r*np.cos(phi)) * np.sin(theta)
+    points[:, 2] = r * np.sin(phi)
+    return points
+
+def iter_sphere_points(n_vertices: int, chunk_size: int = DEFAULT_CHUNK_SIZE, dtype=np.float64):
+    """
+    Yield the Fibonacci sphere lattice of generate_sphere_points in blocks of chunk_size points.
+    """
+    for start, stop in _chunk_bounds(n_vertices, chunk_size):
+        yield _sphere_lattice(np.arange(start, stop, dtype=float), n_vertices, dtype)
+
+def generate_sphere_points(n_vertices: int, dtype=np.float64) -> np.ndarray:
     """
     Generate points for a sphere using the Fibonacci lattice.
     Returns array of xyz positions.
     """
-    indices = np.arange(0, n_vertices, dtype=float) + 0.5
-    phi = np.arccos(1 - 2*indices/n_vertices)
-    theta = np.pi * (1 + 5**0.5) * indices
+    return _sphere_lattice(np.arange(0, n_vertices, dtype=float), n_vertices, dtype)
 
-    x = np.cos(theta) * np.sin(phi)
-    y = np.sin(theta) * np.sin(phi)
-    z = np.cos(phi)
-    return np.vstack((x, y, z)).T
+def iter_noisy_solid(vertices: np.ndarray, n_points: int, noise: float = 0.1, rng=None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, dtype=np.float64):
+    """
+    Yield a noisy point cloud around the vertices of a solid in blocks of chunk_size points.
+    Each point is a uniformly chosen vertex plus Gaussian noise. Vertex choices and noise come
+    from separate child streams of `rng` (a seed or np.random.Generator), so a seed gives the
+    same cloud whatever the chunk size.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    rng = np.random.default_rng(rng)
+    choice_rng, noise_rng = rng.spawn(2)
+    for start, stop in _chunk_bounds(n_points, chunk_size):
+        points = vertices[choice_rng.integers(0, len(vertices), stop - start)]
+        points += noise_rng.normal(0, noise, (stop - start, vertices.shape[1]))
+        yield points.astype(dtype, copy=False)
 
-def generate_noisy_tetrahedron(n_vertices: int, noise: float=0.1) -> np.ndarray:
+def generate_noisy_solid(vertices: np.ndarray, n_points: int, noise: float = 0.1, rng=None,
+                         dtype=np.float64) -> np.ndarray:
+    """
+    Generate a noisy point cloud around the vertices of a solid in one vectorized call.
+    """
+    for points in iter_noisy_solid(vertices, n_points, noise, rng, chunk_size=max(n_points, 1),
+                                  dtype=dtype):
+        return points
+    return np.empty((0, np.shape(vertices)[1]), dtype=dtype)
+
+def generate_noisy_tetrahedron(n_vertices: int, noise: float=0.1, rng=None, dtype=np.float64) -> np.ndarray:
     """
     Generate a noisy tetrahedron point cloud.
     """
-    base = np.array([
-        [1, 1, 1],
-        [-1, -1, 1],
-        [-1, 1, -1],
-        [1, -1, -1]
-    ])
-    pts = []
-    for _ in range(n_vertices):
-        v = base[np.random.choice(4)]
-        pts.append(v + np.random.normal(0, noise, 3))
-    return np.array(pts)
+    return generate_noisy_solid(TETRAHEDRON_VERTICES, n_vertices, noise, rng, dtype)
+
+def iter_torus_points(n_vertices: int, R: float=1.0, r: float=0.3, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      dtype=np.float64):
+    """
+    Yield the torus lattice of generate_torus_points in blocks of chunk_size points.
+    """
+    for start, stop in _chunk_bounds(n_vertices, chunk_size):
+        yield _torus_lattice(np.arange(start, stop, dtype=float), n_vertices, R, r, dtype)
 
-def generate_torus_points(n_vertices: int, R: float=1.0, r: float=0.3) -> np.ndarray:
+def generate_torus_points(n_vertices: int, R: float=1.0, r: float=0.3, dtype=np.float64) -> np.ndarray:
     """
     Generate points for a torus.
+    Points follow a Fibonacci lattice over both angles, covering the surface.
     """
-    theta = np.linspace(0, 2*np.pi, n_vertices)
-    phi = np.linspace(0, 2*np.pi, n_vertices)
-    x = (R + r*np.cos(phi)) * np.cos(theta)
-    y = (R + r*np.cos(phi)) * np.sin(theta)
-    z = r * np.sin(phi)
-    return np.vstack((x, y, z)).T
+    return _torus_lattice(np.arange(0, n_vertices, dtype=float), n_vertices, R, r, dtype)
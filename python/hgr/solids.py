@@ -0,0 +1,174 @@
+from functools import lru_cache
+from itertools import permutations, product
+import numpy as np
+from python.hgr.generators import GOLDEN_RATIO, TETRAHEDRON_VERTICES
+
+# Regular polytopes in the registry and the number of vertices per face.
+# The 120-cell and 600-cell are 4-D; their faces are the 2-D polygons.
+SOLIDS = {
+    'tetrahedron': 3,
+    'cube': 4,
+    'octahedron': 3,
+    'dodecahedron': 5,
+    'icosahedron': 3,
+    '600-cell': 3,
+    '120-cell': 5,
+}
+
+ELEMENT_TYPES = ('vertex', 'edge', 'face')
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+def _signed(values):
+    """Every sign combination of the non-zero entries of values."""
+    values = np.asarray(values, dtype=float)
+    signs = np.array(list(product((1, -1), repeat=len(values))))
+    return np.unique(signs * values, axis=0)
+
+def _even_permutations(values):
+    """Even coordinate permutations of every sign combination of values."""
+    even = [p for p in permutations(range(len(values)))
+            if sum(p[i] > p[j] for i in range(len(p)) for j in range(i + 1, len(p))) % 2 == 0]
+    points = _signed(values)
+    return np.unique(np.concatenate([points[:, p] for p in even]), axis=0)
+
+def _all_permutations(values):
+    points = _signed(values)
+    return np.unique(np.concatenate([points[:, p] for p in permutations(range(len(values)))]), axis=0)
+
+def _adjacency(vertices: np.ndarray) -> np.ndarray:
+    """Vertex adjacency: pairs at the minimum non-zero distance."""
+    gram = vertices @ vertices.T
+    sq = np.diag(gram)
+    dist = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2*gram, 0))
+    np.fill_diagonal(dist, np.inf)
+    return np.isclose(dist, dist.min(), rtol=1e-6)
+
+def _cycles(adjacency: np.ndarray, length: int) -> np.ndarray:
+    """
+    Chordless cycles of the given length in the edge graph, each listed once in
+    path order starting from its lowest vertex. For the regular polytopes the
+    shortest such cycles are exactly the faces.
+    """
+    neighbours = [np.flatnonzero(row) for row in adjacency]
+    cycles = []
+    for start in range(len(neighbours)):
+        paths = [[start]]
+        for _ in range(length - 1):
+            paths = [path + [n] for path in paths for n in neighbours[path[-1]]
+                     if n > start and n not in path]
+        for path in paths:
+            # Close the cycle, list each once (not reversed) and skip ones with a chord
+            if adjacency[path[-1], start] and path[1] < path[-1] and \
+                    not any(adjacency[path[i], path[j]] for i in range(length)
+                            for j in range(i + 2, length) if (i, j) != (0, length - 1)):
+                cycles.append(path)
+    return np.array(cycles, dtype=np.intp)
+
+def _cliques(adjacency: np.ndarray, size: int) -> np.ndarray:
+    """All complete subgraphs of the given size, as sorted vertex tuples."""
+    neighbours = [set(np.flatnonzero(row)) for row in adjacency]
+    cliques = [(v,) for v in range(len(neighbours))]
+    for _ in range(size - 1):
+        cliques = [c + (n,) for c in cliques
+                   for n in sorted(set.intersection(*(neighbours[v] for v in c))) if n > c[-1]]
+    return np.array(cliques, dtype=np.intp)
+
+def _solid_vertices(name: str) -> np.ndarray:
+    phi = GOLDEN_RATIO
+    if name == 'tetrahedron':
+        return TETRAHEDRON_VERTICES.astype(float)
+    if name == 'cube':
+        return _signed([1, 1, 1])
+    if name == 'octahedron':
+        return _all_permutations([1, 0, 0])
+    if name == 'dodecahedron':
+        return np.concatenate([_signed([1, 1, 1]), _even_permutations([0, 1/phi, phi])])
+    if name == 'icosahedron':
+        return _even_permutations([0, 1, phi])
+    if name == '600-cell':
+        return np.concatenate([_signed([0.5] * 4), _all_permutations([1, 0, 0, 0]),
+                               _even_permutations([phi/2, 0.5, 1/(2*phi), 0])])
+    if name == '120-cell':
+        # Dual of the 600-cell: one vertex at the centre of each tetrahedral cell
+        cell600 = _solid_vertices('600-cell')
+        cells = _cliques(_adjacency(cell600), 4)
+        return cell600[cells].mean(axis=1)
+    raise ValueError(f"Unknown solid '{name}'. Choose from {list(SOLIDS)}.")
+
+
+class Solid:
+    """
+    Geometry of a regular polytope, scaled to unit circumradius.
+    Holds vertices (V, dim), edges (E, 2) and faces (F, k) as vertex indices,
+    and the edge midpoints and face centers. All arrays are read-only; obtain
+    instances from get_solid, which builds each solid once.
+    """
+
+    def __init__(self, name: str, vertices: np.ndarray, face_size: int):
+        vertices = vertices / np.linalg.norm(vertices, axis=1).max()
+        adjacency = _adjacency(vertices)
+        self.name = name
+        self.vertices = _read_only(vertices)
+        self.edges = _read_only(np.argwhere(np.triu(adjacency)))
+        self.faces = _read_only(_cycles(adjacency, face_size))
+        self.edge_midpoints = _read_only(vertices[self.edges].mean(axis=1))
+        self.face_centers = _read_only(vertices[self.faces].mean(axis=1))
+
+    @property
+    def dim(self) -> int:
+        return self.vertices.shape[1]
+
+    def __repr__(self):
+        return (f"Solid('{self.name}', vertices={len(self.vertices)}, edges={len(self.edges)}, "
+                f"faces={len(self.faces)})")
+
+    def nearest(self, points: np.ndarray, element: str = 'vertex', block_size: int = 4096):
+        """
+        Nearest vertex, edge or face to each of (N, dim) points.
+        Edges are measured as line segments; faces by their center.
+        Returns (indices, distances), processing block_size points at a time.
+        """
+        if element not in ELEMENT_TYPES:
+            raise ValueError(f"element must be one of {ELEMENT_TYPES}")
+        points = np.asarray(points, dtype=float)
+        if points.shape[-1] != self.dim:
+            raise ValueError(f"Points must have {self.dim} coordinates for the {self.name}.")
+        flat = points.reshape(-1, self.dim)
+        indices = np.empty(len(flat), dtype=np.intp)
+        distances = np.empty(len(flat))
+        for start in range(0, len(flat), block_size):
+            block = flat[start:start + block_size]
+            if element == 'edge':
+                sq = self._segment_sq_distances(block)
+            else:
+                targets = self.vertices if element == 'vertex' else self.face_centers
+                sq = (block**2).sum(axis=1)[:, None] - 2*block @ targets.T + (targets**2).sum(axis=1)
+            best = np.argmin(sq, axis=1)
+            indices[start:start + len(block)] = best
+            distances[start:start + len(block)] = np.sqrt(np.maximum(sq[np.arange(len(block)), best], 0))
+        return indices.reshape(points.shape[:-1]), distances.reshape(points.shape[:-1])
+
+    def _segment_sq_distances(self, points: np.ndarray) -> np.ndarray:
+        """(N, E) squared distances from points to every edge segment, without (N, E, dim) temporaries."""
+        a = self.vertices[self.edges[:, 0]]
+        ab = self.vertices[self.edges[:, 1]] - a
+        ab_sq = (ab**2).sum(axis=1)
+        # |p - a|^2 and (p - a).ab expanded into matrix products
+        pa_sq = (points**2).sum(axis=1)[:, None] - 2*points @ a.T + (a**2).sum(axis=1)
+        pa_ab = points @ ab.T - (a * ab).sum(axis=1)
+        t = np.clip(pa_ab / ab_sq, 0, 1)
+        return pa_sq - 2*t*pa_ab + t**2 * ab_sq
+
+
+@lru_cache(maxsize=None)
+def get_solid(name: str) -> Solid:
+    """
+    Registry of the five Platonic solids plus the 120-cell and 600-cell.
+    Each solid's geometry is generated on first use and cached.
+    """
+    if name not in SOLIDS:
+        raise ValueError(f"Unknown solid '{name}'. Choose from {list(SOLIDS)}.")
+    return Solid(name, _solid_vertices(name), SOLIDS[name])
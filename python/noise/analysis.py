@@ -1,13 +1,85 @@
+# UBP Noise module: generation, analysis, NRCI and GLR metrics
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import numpy as np
+import pandas as pd
+from python.nrci import compute_nrci
+from python.glr.base import glr_error
+from python.noise.core import NoiseSignal, DEFAULT_CHUNK_SIZE, select_channel
+
+# File extensions picked up when a directory of captures is analyzed
+CAPTURE_EXTENSIONS = (".npy", ".bin", ".dat", ".raw")
 
 def coherence_analysis(signal, winlen=128, overlap=0.5):
     """Returns NRCI and mean coherence using NRCI module."""
-    from python.nrci import compute_nrci
     nrci_val, coherence_matrix = compute_nrci(signal, winlen=winlen, overlap=overlap)
     mean_coherence = np.mean(coherence_matrix)
     return nrci_val, mean_coherence
 
 def glr_analysis(bitfield):
     """Returns GLR error using GLR module."""
-    from python.glr.base import glr_error
     return glr_error(bitfield)
+
+def load_capture(path, dtype=np.float64, samplerate=1.0, chunk_size=DEFAULT_CHUNK_SIZE,
+                 max_in_memory=1 << 30):
+    """
+    Open a capture for analysis.
+    Captures up to `max_in_memory` bytes are read from disk once into RAM, so
+    every later pass over the samples is served from memory; larger captures
+    are memory-mapped and streamed. analyze_signal then reads a streamed
+    capture twice: once for the mean and NRCI, once for the bitfield, whose
+    default threshold is the mean and so cannot be set in the first pass.
+    """
+    path = str(path)
+    if os.path.getsize(path) > max_in_memory:
+        return NoiseSignal.from_file(path, dtype=dtype, samplerate=samplerate, chunk_size=chunk_size)
+    data = np.load(path) if path.endswith(".npy") else np.fromfile(path, dtype=dtype)
+    return NoiseSignal(select_channel(data), samplerate=samplerate, label=path, chunk_size=chunk_size)
+
+def analyze_signal(signal, winlen=128, overlap=0.5):
+    """
+    Fused per-signal pipeline: threshold, toggle rate, windowed NRCI and GLR error.
+    The mean and NRCI come from one pass over the samples (NoiseSignal.scan) and
+    the bitfield from a second; toggles and GLR then read the packed bitfield.
+    """
+    signal.scan([(winlen, overlap)])
+    return {
+        "label": signal.label,
+        "samples": len(signal.data),
+        "samplerate": signal.samplerate,
+        "threshold": float(signal.threshold),
+        "toggle_count": signal.toggle_count(),
+        "toggle_rate": float(signal.toggle_rate()),
+        "nrci": float(signal.nrci(winlen=winlen, overlap=overlap)),
+        "glr_error": float(signal.glr()),
+    }
+
+def _analyze_capture(path, dtype, samplerate, winlen, overlap, chunk_size, max_in_memory):
+    signal = load_capture(path, dtype=dtype, samplerate=samplerate, chunk_size=chunk_size,
+                          max_in_memory=max_in_memory)
+    return analyze_signal(signal, winlen=winlen, overlap=overlap)
+
+def batch_analysis(captures, workers=None, dtype=np.float64, samplerate=1.0, winlen=128, overlap=0.5,
+                   chunk_size=DEFAULT_CHUNK_SIZE, max_in_memory=1 << 30) -> pd.DataFrame:
+    """
+    Analyze many captures in parallel and return one report row per capture.
+    `captures` is a directory (every file with a CAPTURE_EXTENSIONS suffix) or a
+    list of file paths. Raw binary files are read as `dtype`. Each capture is
+    processed in a worker process by analyze_signal; workers=1 runs in-process.
+    """
+    if isinstance(captures, (str, os.PathLike)) and os.path.isdir(captures):
+        captures = sorted(os.path.join(captures, name) for name in os.listdir(captures)
+                          if name.endswith(CAPTURE_EXTENSIONS))
+    paths = [str(path) for path in captures]
+    job = partial(_analyze_capture, dtype=dtype, samplerate=samplerate, winlen=winlen, overlap=overlap,
+                  chunk_size=chunk_size, max_in_memory=max_in_memory)
+
+    workers = min(workers or os.cpu_count() or 1, max(len(paths), 1))
+    if workers == 1:
+        rows = [job(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(job, paths))
+    return pd.DataFrame(rows, columns=["label", "samples", "samplerate", "threshold", "toggle_count",
+                                       "toggle_rate", "nrci", "glr_error"])
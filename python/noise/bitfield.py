@@ -0,0 +1,77 @@
+import numpy as np
+
+# Set-bit counts for every byte value, used when np.bitwise_count is unavailable (NumPy < 2.0)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits in each unsigned integer word (uint8, uint32, ...)."""
+    words = np.asarray(words)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words)
+    if words.dtype.itemsize == 1:
+        return _POPCOUNT_TABLE[words]
+    # Wider words: count the set bits of each byte
+    as_bytes = words[..., None].copy().view(np.uint8)
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+class PackedBitfield:
+    """
+    UBP bitfield packed 8 bits per byte (np.packbits, big-endian bit order).
+    Uses 1/64 of the memory of an int64 bit array. Counting and toggle
+    analysis run directly on the packed words; np.asarray() unpacks to 0/1.
+    """
+
+    def __init__(self, words: np.ndarray, length: int):
+        self.words = np.asarray(words, dtype=np.uint8)
+        self.length = int(length)
+        if len(self.words) != (self.length + 7) // 8:
+            raise ValueError("Packed word count does not match bit length.")
+
+    @classmethod
+    def from_bits(cls, bits: np.ndarray) -> "PackedBitfield":
+        bits = np.asarray(bits).ravel()
+        return cls(np.packbits(bits.astype(bool)), len(bits))
+
+    def __len__(self):
+        return self.length
+
+    def __array__(self, dtype=None, copy=None):
+        bits = self.unpack()
+        return bits if dtype is None else bits.astype(dtype)
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.nbytes
+
+    def unpack(self) -> np.ndarray:
+        """Return the bits as a uint8 array of 0/1."""
+        return np.unpackbits(self.words, count=self.length)
+
+    def bit(self, index: int) -> int:
+        """Value of a single bit."""
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("Bit index out of range.")
+        return int(self.words[index >> 3] >> (7 - (index & 7))) & 1
+
+    def popcount(self) -> int:
+        """Total number of set bits (padding bits are always zero)."""
+        return int(np.sum(popcount(self.words), dtype=np.int64))
+
+    def toggle_count(self) -> int:
+        """
+        Number of state changes between consecutive bits.
+        Each word is XORed with a copy of the stream shifted left by one bit, so
+        bit j of the result is b[j] ^ b[j+1]; the set bits are then counted.
+        """
+        if self.length < 2:
+            return 0
+        words = self.words
+        shifted = np.left_shift(words, 1)
+        shifted[:-1] |= words[1:] >> 7
+        diff = words ^ shifted
+        # Only pairs (j, j+1) with j <= length - 2 are real; mask the tail of the last word
+        valid = self.length - 1 - 8 * (len(words) - 1)
+        diff[-1] &= (0xFF << (8 - valid)) & 0xFF
+        return int(np.sum(popcount(diff), dtype=np.int64))
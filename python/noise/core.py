@@ -1,17 +1,112 @@
 import numpy as np
-from python.nrci import compute_nrci  # NRCI from your repo
-from python.glr.base import glr_error  # GLR base error metric
+from python.nrci import blockwise_nrci, sample_segment_starts, DEFAULT_MAX_SEGMENTS  # NRCI from your repo
+from python.glr.base import glr_word_errors  # GLR base error metric
+from python.noise.bitfield import PackedBitfield
+from python.noise import spectral
+
+# Samples processed per step by the streaming reductions
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+def select_channel(data: np.ndarray, channel: int = None) -> np.ndarray:
+    """
+    One channel of a (channels, length) capture as a 1-D view. 1-D data is
+    returned as is; multi-channel data needs an explicit `channel`.
+    """
+    if data.ndim == 1:
+        if channel not in (None, 0):
+            raise ValueError("capture has a single channel")
+        return data
+    data = data.reshape(data.shape[0], -1)
+    if channel is None:
+        if data.shape[0] != 1:
+            raise ValueError(f"capture has {data.shape[0]} channels; pass channel= to select one")
+        channel = 0
+    return data[channel]
 
 class NoiseSignal:
     """
     UBP NoiseSignal: Handles generation, loading, and analysis of noise signals.
     Integrates NRCI and GLR metrics via your repo modules.
+
+    All analysis runs as streaming reductions over chunks of `chunk_size`
+    samples, so signals memory-mapped with from_file never have to fit in
+    RAM. In-memory and memory-mapped signals give identical results.
+
+    Derived quantities (mean, threshold, bitfield, toggle count, NRCI, GLR,
+    power spectral density) are computed lazily and cached. Assigning `data` clears the cache,
+    assigning `threshold` clears everything derived from the bitfield and assigning
+    `samplerate` clears the spectral estimates; call invalidate() after modifying `data` in place.
     """
 
-    def __init__(self, data: np.ndarray, samplerate: float = 1.0, label: str = "unknown"):
-        self.data = np.asarray(data)
+    def __init__(self, data: np.ndarray, samplerate: float = 1.0, label: str = "unknown",
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, threshold: float = None):
+        self._cache = {}
+        self._threshold = threshold
+        self.data = data
         self.samplerate = samplerate
         self.label = label
+        self.chunk_size = chunk_size
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = np.asarray(value)
+        self.invalidate()
+
+    @property
+    def samplerate(self) -> float:
+        return self._samplerate
+
+    @samplerate.setter
+    def samplerate(self, value):
+        # The spectral estimates are scaled by the sample rate
+        self._samplerate = value
+        for key in [key for key in self._cache if isinstance(key, tuple) and key[0] == "psd"]:
+            del self._cache[key]
+
+    @property
+    def threshold(self) -> float:
+        """Bitfield threshold; defaults to the mean of the data."""
+        if self._threshold is None:
+            return self.mean()
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value):
+        self._threshold = value
+        for key in ("bitfield", "toggles", "glr"):
+            self._cache.pop(key, None)
+
+    def invalidate(self):
+        """Drop all cached derived quantities."""
+        self._cache.clear()
+
+    @property
+    def bitfield(self) -> PackedBitfield:
+        """Packed bitfield at the current threshold (cached)."""
+        if "bitfield" not in self._cache:
+            self._cache["bitfield"] = self._pack_bitfield(self.threshold)
+        return self._cache["bitfield"]
+
+    @classmethod
+    def from_file(cls, path, dtype=np.float64, samplerate=1.0, label=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE, channel=None):
+        """
+        Memory-map a capture from disk without reading it into RAM.
+        `.npy` files are opened with their stored dtype; anything else is
+        treated as raw binary samples of `dtype`. For a (channels, length)
+        `.npy` file, `channel` selects the channel to analyze.
+        """
+        path = str(path)
+        if path.endswith(".npy"):
+            data = np.load(path, mmap_mode="r")
+        else:
+            data = np.memmap(path, dtype=dtype, mode="r")
+        return cls(select_channel(data, channel), samplerate=samplerate, label=label or path,
+                   chunk_size=chunk_size)
 
     @classmethod
     def synthetic_thermal(cls, length, resistance=1.0, temperature=300.0, samplerate=1.0, rng=None):
@@ -22,21 +117,140 @@ class NoiseSignal:
         noise = rng.normal(0, np.sqrt(power), length)
         return cls(noise, samplerate=samplerate, label="Synthetic Thermal")
 
-    def to_bitfield(self, threshold=None):
+    def _chunks(self):
+        """Yield (start, chunk) pairs covering the data."""
+        for start in range(0, len(self.data), self.chunk_size):
+            yield start, self.data[start:start + self.chunk_size]
+
+    def _bit_chunks(self, threshold):
+        """Yield the thresholded bitfield chunk by chunk as boolean arrays."""
+        for _, chunk in self._chunks():
+            yield chunk > threshold
+
+    def mean(self):
+        """Mean of the data, accumulated chunk by chunk (cached)."""
+        self.scan(nrci=())
+        return self._cache["mean"]
+
+    def scan(self, nrci=((128, 0.5),), max_segments=DEFAULT_MAX_SEGMENTS):
+        """
+        One chunked pass over the data that caches the mean and the NRCI for each
+        (winlen, overlap) in `nrci`, gathering the sampled NRCI windows as the
+        chunks go by. Quantities already cached are not recomputed.
+        """
+        pending = {}
+        for winlen, overlap in nrci:
+            key = ("nrci", winlen, overlap, max_segments)
+            if key not in self._cache:
+                pending[key] = sample_segment_starts(len(self.data), winlen, overlap, max_segments)
+        need_mean = "mean" not in self._cache
+        if not pending and not need_mean:
+            return
+        windows = {key: [] for key in pending}
+        taken = dict.fromkeys(pending, 0)
+        # Samples kept from the previous chunk for windows that straddle chunks
+        overhang = max((key[1] for key in pending), default=1) - 1
+        total, carry = 0.0, self.data[:0]
+        for start, chunk in self._chunks():
+            if need_mean:
+                total += np.sum(chunk, dtype=np.float64)
+            if not pending:
+                continue
+            buffer = np.concatenate([carry, chunk]) if len(carry) else chunk
+            offset = start - len(carry)
+            for key, starts in pending.items():
+                winlen = key[1]
+                stop = np.searchsorted(starts, offset + len(buffer) - winlen, side="right")
+                if stop > taken[key]:
+                    local = starts[taken[key]:stop] - offset
+                    windows[key].append(np.array(buffer[local[:, None] + np.arange(winlen)]))
+                    taken[key] = stop
+            carry = np.array(buffer[len(buffer) - min(overhang, len(buffer)):])
+        if need_mean:
+            self._cache["mean"] = total / len(self.data) if len(self.data) else 0.0
+        for key, parts in windows.items():
+            self._cache[key] = blockwise_nrci(np.concatenate(parts), block_size=max(1, self.chunk_size // key[1]))
+
+    def to_bitfield(self, threshold=None, packed=True):
+        """
+        Threshold the data into a bitfield (default threshold: self.threshold).
+        Returns a PackedBitfield (1 bit per sample) unless packed=False, which
+        gives the legacy int array.
+        """
+        if threshold is None and packed:
+            return self.bitfield
         if threshold is None:
-            threshold = np.mean(self.data)
-        return (self.data > threshold).astype(int)
+            threshold = self.threshold
+        if not packed:
+            bits = np.empty(len(self.data), dtype=int)
+            for (start, chunk), chunk_bits in zip(self._chunks(), self._bit_chunks(threshold)):
+                bits[start:start + len(chunk)] = chunk_bits
+            return bits
+        return self._pack_bitfield(threshold)
+
+    def _pack_bitfield(self, threshold):
+        words = np.empty((len(self.data) + 7) // 8, dtype=np.uint8)
+        filled = 0
+        carry = np.empty(0, dtype=bool)
+        for bits in self._bit_chunks(threshold):
+            # Pack whole bytes only; leftover bits are carried into the next chunk
+            if len(carry):
+                bits = np.concatenate([carry, bits])
+            usable = len(bits) // 8 * 8
+            words[filled:filled + usable // 8] = np.packbits(bits[:usable])
+            filled += usable // 8
+            carry = bits[usable:]
+        if len(carry):
+            words[filled] = np.packbits(carry)[0]
+        return PackedBitfield(words, len(self.data))
+
+    def toggle_count(self) -> int:
+        """Number of state changes in the bitfield (cached)."""
+        if "toggles" not in self._cache:
+            self._cache["toggles"] = self.bitfield.toggle_count()
+        return self._cache["toggles"]
 
     def toggle_rate(self):
-        bits = self.to_bitfield()
-        changes = np.sum(np.abs(np.diff(bits)))
-        duration = len(bits) / self.samplerate
-        return changes / duration if duration > 0 else 0
+        duration = len(self.data) / self.samplerate
+        return self.toggle_count() / duration if duration > 0 else 0
 
-    def nrci(self, winlen=128, overlap=0.5):
-        """Compute NRCI using your repo's NRCI module."""
-        return compute_nrci(self.data, winlen=winlen, overlap=overlap)
+    def nrci(self, winlen=128, overlap=0.5, max_segments=DEFAULT_MAX_SEGMENTS):
+        """
+        Compute NRCI using your repo's NRCI module (cached). Signals with more than
+        max_segments windows are estimated from a fixed sample of them (see
+        python.nrci.sampled_nrci), so the cost stays linear in the signal length.
+        """
+        self.scan([(winlen, overlap)], max_segments)
+        return self._cache[("nrci", winlen, overlap, max_segments)]
 
     def glr(self):
         """Compute GLR error using your repo's GLR base module."""
-        return glr_error(self.to_bitfield())
+        if "glr" not in self._cache:
+            bitfield = self.bitfield
+            # Unpack whole 24-bit words from the packed bitfield a chunk at a time
+            step = max(1, self.chunk_size // 192) * 24
+            usable = len(bitfield) // 24 * 3
+            errors, words = 0, 0
+            for start in range(0, usable, step):
+                block = bitfield.words[start:min(start + step, usable)]
+                chunk_errors, chunk_words = glr_word_errors(np.unpackbits(block))
+                errors += chunk_errors
+                words += chunk_words
+            self._cache["glr"] = errors / words if words else 0.0
+        return self._cache["glr"]
+
+    def psd(self, nperseg=256, overlap=0.5, window="hann"):
+        """
+        Welch power spectral density, averaged over overlapping segments
+        streamed a block at a time (cached). Returns (frequencies, psd).
+        """
+        key = ("psd", nperseg, overlap, window)
+        if key not in self._cache:
+            self._cache[key] = spectral.welch_psd(self.data, self.samplerate, nperseg, overlap, window,
+                                                  block_size=max(1, self.chunk_size // nperseg))
+        return self._cache[key]
+
+    def spectrogram(self, nperseg=256, overlap=0.5, window="hann"):
+        """Per-segment power spectral density. Returns (frequencies, times, sxx)."""
+        return spectral.spectrogram(self.data, self.samplerate, nperseg, overlap, window,
+                                    block_size=max(1, self.chunk_size // nperseg))
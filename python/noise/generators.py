@@ -0,0 +1,98 @@
+import numpy as np
+from python.noise.core import DEFAULT_CHUNK_SIZE
+
+BOLTZMANN = 1.380649e-23  # J/K
+ELECTRON_CHARGE = 1.602176634e-19  # C
+
+# All generators draw their random numbers time-major, (samples, channels), so the
+# output for a given seed is the same whatever chunk size it is produced in.
+
+def _thermal_chunks(channels, bounds, rng, resistance=1.0, temperature=300.0, samplerate=1.0):
+    """Johnson-Nyquist noise: Gaussian with variance 4kTRB."""
+    sigma = np.sqrt(4 * BOLTZMANN * temperature * resistance * samplerate)
+    for start, stop in bounds:
+        yield sigma * rng.standard_normal((stop - start, channels)).T
+
+def _pink_chunks(channels, bounds, rng, amplitude=1.0, octaves=16):
+    """
+    1/f noise by the Voss-McCartney algorithm: the sum of `octaves` held
+    Gaussian sources, where source k is redrawn every 2^k samples. Exactly one
+    source updates per sample (chosen by the trailing zeros of the sample
+    index), so each sample consumes one random draw per channel.
+    """
+    state = rng.standard_normal((octaves, channels))
+    scale = amplitude / np.sqrt(octaves)
+    for start, stop in bounds:
+        draws = rng.standard_normal((stop - start, channels))
+        index = np.arange(start, stop) + 1  # 1-based so every index has finite trailing zeros
+        out = np.zeros((stop - start, channels))
+        for k in range(octaves):
+            step = 1 << k
+            # Index of the latest update of source k at or before each sample
+            if k < octaves - 1:
+                last = step * (2 * ((index - step) // (2 * step)) + 1)
+            else:
+                last = index // step * step  # The top source also takes all higher octaves
+            in_chunk = last > start
+            values = np.where(in_chunk[:, None], draws[np.maximum(last - start - 1, 0)], state[k])
+            out += values
+            state[k] = values[-1]
+        yield scale * out.T
+
+def _shot_chunks(channels, bounds, rng, rate=1e6, charge=ELECTRON_CHARGE, samplerate=1.0):
+    """Shot noise: current fluctuation of Poisson arrivals at `rate` events/s."""
+    lam = rate / samplerate
+    for start, stop in bounds:
+        counts = rng.poisson(lam, (stop - start, channels))
+        yield charge * samplerate * (counts.T - lam)
+
+def _telegraph_chunks(channels, bounds, rng, amplitude=1.0, switch_rate=0.01, samplerate=1.0):
+    """Random telegraph noise: +/- amplitude, switching at `switch_rate` per second."""
+    p_switch = -np.expm1(-switch_rate / samplerate)
+    state = rng.integers(0, 2, channels).astype(bool)
+    for start, stop in bounds:
+        flips = rng.random((stop - start, channels)) < p_switch
+        levels = state ^ (np.cumsum(flips, axis=0) % 2).astype(bool)
+        state = levels[-1]
+        yield amplitude * (2.0 * levels.T - 1.0)
+
+NOISE_TYPES = {
+    "thermal": _thermal_chunks,
+    "pink": _pink_chunks,
+    "shot": _shot_chunks,
+    "telegraph": _telegraph_chunks,
+}
+
+def iter_noise(kind: str, channels: int, length: int, chunk_size: int = None, rng=None, **params):
+    """
+    Yield (channels, n) blocks of synthetic noise covering `length` samples.
+    `kind` is one of NOISE_TYPES; `params` go to that generator. `rng` may be a
+    seed or np.random.Generator. Only one block is held in memory at a time;
+    by default a block holds about DEFAULT_CHUNK_SIZE samples over all channels.
+    """
+    if kind not in NOISE_TYPES:
+        raise ValueError(f"Unknown noise type '{kind}'. Choose from {sorted(NOISE_TYPES)}.")
+    rng = np.random.default_rng(rng)
+    chunk_size = chunk_size or max(1, DEFAULT_CHUNK_SIZE // max(channels, 1))
+    bounds = [(start, min(start + chunk_size, length)) for start in range(0, length, chunk_size)]
+    return NOISE_TYPES[kind](channels, bounds, rng, **params)
+
+def generate_noise(kind: str, channels: int, length: int, rng=None, chunk_size: int = None,
+                   path=None, dtype=np.float64, **params) -> np.ndarray:
+    """
+    Generate a (channels, length) noise ensemble in one call.
+    With `path`, the samples are streamed straight into a memory-mapped `.npy`
+    file (readable with np.load, or one channel at a time with
+    NoiseSignal.from_file(path, channel=i)) instead of RAM.
+    """
+    if path is not None:
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(channels, length))
+    else:
+        out = np.empty((channels, length), dtype=dtype)
+    start = 0
+    for block in iter_noise(kind, channels, length, chunk_size=chunk_size, rng=rng, **params):
+        out[:, start:start + block.shape[1]] = block
+        start += block.shape[1]
+    if path is not None:
+        out.flush()
+    return out
@@ -0,0 +1,75 @@
+from functools import lru_cache
+import numpy as np
+from python.nrci import segment_hop, segment_signal
+
+@lru_cache(maxsize=32)
+def get_window(name: str, length: int) -> np.ndarray:
+    """
+    Periodic spectral-analysis window, computed once per (name, length).
+    The cached array is read-only.
+    """
+    n = np.arange(length)
+    phase = 2 * np.pi * n / length
+    if name == "hann":
+        window = 0.5 - 0.5 * np.cos(phase)
+    elif name == "hamming":
+        window = 0.54 - 0.46 * np.cos(phase)
+    elif name == "blackman":
+        window = 0.42 - 0.5 * np.cos(phase) + 0.08 * np.cos(2 * phase)
+    elif name == "boxcar":
+        window = np.ones(length)
+    else:
+        raise ValueError(f"Unknown window '{name}'.")
+    window.setflags(write=False)
+    return window
+
+def segment_spectra(data: np.ndarray, samplerate: float = 1.0, nperseg: int = 256, overlap: float = 0.5,
+                    window: str = "hann", block_size: int = 4096):
+    """
+    Yield one-sided power spectral densities of overlapping segments, a block at a time.
+    Segments are taken as a strided view over `data` (which may be memory-mapped), mean-detrended,
+    windowed and transformed `block_size` segments at a time. Each yielded array has shape
+    (segments_in_block, nperseg // 2 + 1) and is scaled as a density (units^2 / Hz).
+    """
+    segments = segment_signal(data, winlen=nperseg, overlap=overlap)
+    win = get_window(window, nperseg)
+    scale = 1.0 / (samplerate * np.sum(win ** 2))
+    for start in range(0, len(segments), block_size):
+        block = np.asarray(segments[start:start + block_size], dtype=float)
+        block = (block - block.mean(axis=1, keepdims=True)) * win
+        power = np.abs(np.fft.rfft(block, axis=1)) ** 2 * scale
+        # Fold negative frequencies into the one-sided spectrum (not DC or Nyquist)
+        if nperseg % 2:
+            power[:, 1:] *= 2
+        else:
+            power[:, 1:-1] *= 2
+        yield power
+
+def welch_psd(data: np.ndarray, samplerate: float = 1.0, nperseg: int = 256, overlap: float = 0.5,
+              window: str = "hann", block_size: int = 4096):
+    """
+    Welch power spectral density: the average of segment spectra, accumulated block by block.
+    Returns (frequencies, psd).
+    """
+    total = np.zeros(nperseg // 2 + 1)
+    count = 0
+    for power in segment_spectra(data, samplerate, nperseg, overlap, window, block_size):
+        total += power.sum(axis=0)
+        count += len(power)
+    return np.fft.rfftfreq(nperseg, d=1.0 / samplerate), total / count
+
+def spectrogram(data: np.ndarray, samplerate: float = 1.0, nperseg: int = 256, overlap: float = 0.5,
+                window: str = "hann", block_size: int = 4096):
+    """
+    Short-time power spectral density of every segment.
+    Returns (frequencies, segment_center_times, sxx) with sxx of shape (frequencies, segments).
+    """
+    n_segments = len(segment_signal(data, winlen=nperseg, overlap=overlap))
+    hop = segment_hop(nperseg, overlap)
+    sxx = np.empty((nperseg // 2 + 1, n_segments))
+    start = 0
+    for power in segment_spectra(data, samplerate, nperseg, overlap, window, block_size):
+        sxx[:, start:start + len(power)] = power.T
+        start += len(power)
+    times = (np.arange(n_segments) * hop + nperseg / 2) / samplerate
+    return np.fft.rfftfreq(nperseg, d=1.0 / samplerate), times, sxx
@@ -1,5 +1,6 @@
 import numpy as np
 from typing import List
+from python.noise.bitfield import popcount
 
 def calculate_nrci(bit_vector: np.ndarray, reference_vectors: List[np.ndarray]) -> float:
     """
@@ -28,3 +29,105 @@ def batch_nrci(vectors: List[np.ndarray], reference_vectors: List[np.ndarray]) -
     Returns a list of NRCI scores.
     """
     return [calculate_nrci(v, reference_vectors) for v in vectors]
+
+# Windows an NRCI estimate is computed from; longer signals are sampled down to this many
+DEFAULT_MAX_SEGMENTS = 2048
+
+def segment_hop(winlen: int, overlap: float) -> int:
+    """Samples between the starts of consecutive windows."""
+    return max(1, int(round(winlen * (1 - overlap))))
+
+def segment_signal(signal: np.ndarray, winlen: int = 128, overlap: float = 0.5) -> np.ndarray:
+    """
+    Split a 1-D signal into overlapping windows of length winlen.
+    Returns a strided (M, winlen) view, so memory-mapped signals are not read until used.
+    """
+    signal = np.asarray(signal)
+    if len(signal) < winlen:
+        raise ValueError("Signal is shorter than the NRCI window length.")
+    return np.lib.stride_tricks.sliding_window_view(signal, winlen)[::segment_hop(winlen, overlap)]
+
+def _unit_segments(segments: np.ndarray) -> np.ndarray:
+    """Scale each segment to unit norm (zero segments stay zero)."""
+    segments = np.asarray(segments, dtype=float)
+    norms = np.linalg.norm(segments, axis=1, keepdims=True)
+    return segments / (norms + 1e-12)
+
+def compute_nrci(signal: np.ndarray, winlen: int = 128, overlap: float = 0.5):
+    """
+    Windowed NRCI of a 1-D signal.
+    The signal is split into overlapping segments and the coherence between each pair is
+    C_ij = |sum(xi * xj)| / sqrt(sum(xi^2) * sum(xj^2)).
+    NRCI = 1 - variance of the off-diagonal coherence values.
+    Returns (nrci, coherence_matrix).
+    """
+    units = _unit_segments(segment_signal(signal, winlen, overlap))
+    coherence_matrix = np.abs(units @ units.T)
+    off_diagonal = coherence_matrix[np.triu_indices(len(units), k=1)]
+    nrci = 1.0 - float(np.var(off_diagonal)) if off_diagonal.size else 1.0
+    return nrci, coherence_matrix
+
+def blockwise_nrci(segments: np.ndarray, block_size: int = 1024) -> float:
+    """
+    NRCI from a (M, winlen) array of segments without building the M x M coherence matrix.
+    Pairs of segment blocks are correlated one at a time and only the running moments of the
+    coherence values are kept, so memory is bounded by block_size. Every pair is visited, so
+    the cost is quadratic in M; use sampled_nrci for long signals. Matches compute_nrci up to
+    floating-point rounding.
+    """
+    count, total, total_sq = 0, 0.0, 0.0
+    n_segments = len(segments)
+    for i in range(0, n_segments, block_size):
+        block_i = _unit_segments(segments[i:i + block_size])
+        for j in range(i, n_segments, block_size):
+            block_j = block_i if j == i else _unit_segments(segments[j:j + block_size])
+            coherence = np.abs(block_i @ block_j.T)
+            if j == i:
+                coherence = coherence[np.triu_indices(len(block_i), k=1)]
+            count += coherence.size
+            total += float(np.sum(coherence))
+            total_sq += float(np.sum(np.square(coherence)))
+    if count == 0:
+        return 1.0
+    mean = total / count
+    return 1.0 - max(total_sq / count - mean ** 2, 0.0)
+
+def sample_segment_starts(length: int, winlen: int = 128, overlap: float = 0.5,
+                          max_segments: int = DEFAULT_MAX_SEGMENTS, seed: int = 0) -> np.ndarray:
+    """
+    Sorted start offsets of the windows sampled_nrci uses for a signal of `length` samples:
+    every window when there are at most max_segments, otherwise a fixed (seeded) uniform
+    sample of max_segments of them.
+    """
+    if length < winlen:
+        raise ValueError("Signal is shorter than the NRCI window length.")
+    hop = segment_hop(winlen, overlap)
+    n_segments = (length - winlen) // hop + 1
+    if n_segments <= max_segments:
+        return np.arange(n_segments) * hop
+    picks = np.random.default_rng(seed).choice(n_segments, max_segments, replace=False)
+    return np.sort(picks) * hop
+
+def sampled_nrci(signal: np.ndarray, winlen: int = 128, overlap: float = 0.5,
+                 max_segments: int = DEFAULT_MAX_SEGMENTS, block_size: int = 1024) -> float:
+    """
+    NRCI of a 1-D signal from at most max_segments windows (see sample_segment_starts).
+    Short signals give exactly compute_nrci. For longer ones the variance is taken over every
+    pair of sampled windows, an estimate whose cost does not depend on the signal length;
+    the sampled windows are read in signal order, so memory-mapped data is read in one pass.
+    """
+    signal = np.asarray(signal)
+    starts = sample_segment_starts(len(signal), winlen, overlap, max_segments)
+    return blockwise_nrci(signal[starts[:, None] + np.arange(winlen)], block_size)
+
+def calculate_nrci_packed(word: int, reference_words: np.ndarray) -> float:
+    """
+    calculate_nrci for bit vectors packed into unsigned integers (e.g. OFBIT uint32 words).
+    For 0/1 vectors the dot product is popcount(a & b) and the norms are sqrt(popcount),
+    so no unpacking is needed.
+    """
+    reference_words = np.asarray(reference_words)
+    word = reference_words.dtype.type(word)
+    overlap = popcount(reference_words & word).astype(np.int64)
+    norm_product = np.sqrt(popcount(word).astype(np.int64) * popcount(reference_words)) + 1e-12
+    return float(np.mean(overlap / norm_product))
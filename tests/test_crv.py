@@ -0,0 +1,314 @@
+import shutil
+import numpy as np
+import pytest
+from python.crv.loader import CRVCatalog
+
+CSV = "data/crv_catalog.csv"
+
+@pytest.fixture
+def catalog(tmp_path):
+    path = tmp_path / "crv_catalog.csv"
+    shutil.copy(CSV, path)
+    return CRVCatalog(str(path))
+
+def test_indexed_lookups_match_scans(catalog):
+    records = catalog.df.to_dict(orient="records")
+    assert catalog.get_node(records[10]["Node_ID"]) == records[10]
+    assert catalog.get_node(-1) is None
+    for column in ("Realm", "Solid", "CRV_Type", "Node_Type"):
+        for value in catalog.df[column].unique():
+            assert list(catalog.get_by_column(column, value)) == [r for r in records if r[column] == value]
+    assert list(catalog.all_nodes()) == records
+    assert len(catalog.all_nodes()) == len(records) and catalog.all_nodes()[-1] == records[-1]
+
+def test_set_value_updates_indexes(catalog):
+    node_id = catalog.get_by_column("Realm", "quantum")[0]["Node_ID"]
+    before = len(catalog.get_by_column("Realm", "quantum"))
+    assert catalog.set_value(node_id, "Realm", "biological")
+    assert len(catalog.get_by_column("Realm", "quantum")) == before - 1
+    assert node_id in [r["Node_ID"] for r in catalog.get_by_column("Realm", "biological")]
+    assert catalog.set_value(node_id, "Node_ID", 10_000)
+    assert catalog.get_node(node_id) is None and catalog.get_node(10_000)["Realm"] == "biological"
+    assert not catalog.set_value(-1, "Realm", "quantum")
+
+def test_binary_cache_roundtrip_and_invalidation(tmp_path):
+    import os
+    import pandas as pd
+    from python.crv.cache import cache_path, read_catalog_csv
+    path = str(tmp_path / "crv_catalog.csv")
+    df = pd.read_csv(CSV)
+    df.loc[3, "Description"] = None
+    df.to_csv(path, index=False)
+
+    first = read_catalog_csv(path)
+    assert os.path.exists(os.path.join(cache_path(path), "meta.json"))
+    cached = read_catalog_csv(path)
+    pd.testing.assert_frame_equal(cached, first, check_index_type=False)
+    assert pd.isna(cached.loc[3, "Description"])
+
+    # Touching the file keeps the cache; changing the content rebuilds it
+    os.utime(path, ns=(1, 1))
+    pd.testing.assert_frame_equal(read_catalog_csv(path), first, check_index_type=False)
+    df.loc[0, "CRV_Value"] = 42.0
+    df.to_csv(path, index=False)
+    assert read_catalog_csv(path).loc[0, "CRV_Value"] == 42.0
+
+    catalog = CRVCatalog(path)
+    catalog.set_value(1, "CRV_Value", 7.0)
+    catalog.save()
+    assert CRVCatalog(path).get_node(1)["CRV_Value"] == 7.0
+
+def test_spatial_index_matches_brute_force():
+    from python.crv.spatial import SpatialIndex
+    rng = np.random.default_rng(0)
+    positions = np.concatenate([rng.normal(size=(3000, 3)), rng.uniform(-4, 4, (1000, 3))])
+    frequencies = rng.uniform(0, 10, len(positions))
+    index = SpatialIndex(positions, frequencies)
+    queries = rng.normal(size=(500, 3)) * 2
+
+    def brute(k, mask):
+        d = np.linalg.norm(queries[:, None] - positions[None], axis=2)
+        d[:, ~mask] = np.inf
+        return np.sort(d, axis=1)[:, :k]
+
+    everything = np.ones(len(positions), dtype=bool)
+    assert np.allclose(index.knn(queries, k=5)[1], brute(5, everything))
+    band = (frequencies >= 2) & (frequencies <= 3)
+    assert np.allclose(index.knn(queries, k=3, band=(2, 3))[1], brute(3, band))
+
+    rows, distances, offsets = index.radius(queries, 0.3)
+    d = np.linalg.norm(queries[:, None] - positions[None], axis=2)
+    assert np.array_equal(np.diff(offsets), (d <= 0.3).sum(axis=1))
+    assert np.allclose(distances[offsets[9]:offsets[10]], np.sort(d[9][d[9] <= 0.3]))
+    assert np.array_equal(np.sort(index.frequency_band(2, 3)), np.flatnonzero(band))
+
+    # Incremental updates before and after the automatic rebuild
+    for row in rng.choice(len(positions), 300, replace=False):
+        positions[row] = rng.normal(size=3) * 3
+        frequencies[row] += 1
+        index.update(row, position=positions[row], frequency=frequencies[row])
+    assert np.allclose(index.knn(queries, k=5)[1], brute(5, everything))
+    assert np.array_equal(np.sort(index.frequency_band(2, 3)),
+                          np.flatnonzero((frequencies >= 2) & (frequencies <= 3)))
+
+def test_catalog_spatial_queries(catalog):
+    node = catalog.get_node(5)
+    point = [node["Position_X"], node["Position_Y"], node["Position_Z"]]
+    ids, distances = catalog.nearest_nodes([point], k=1)
+    assert distances[0, 0] == 0 and catalog.get_node(ids[0, 0])["Position_X"] == node["Position_X"]
+    catalog.set_value(5, "Position_X", 50.0)
+    ids, _ = catalog.nearest_nodes([[50.0, point[1], point[2]]], k=1)
+    assert ids[0, 0] == 5
+    band = catalog.nodes_in_band(1e12, 2e12)
+    assert all(1e12 <= r["Frequency_Hz"] <= 2e12 for r in band)
+    assert len(band) == ((catalog.df["Frequency_Hz"] >= 1e12) & (catalog.df["Frequency_Hz"] <= 2e12)).sum()
+
+def test_node_table_and_vectorized_analysis():
+    import pandas as pd
+    from python.crv import analysis
+    from python.crv.node import CRVNode, CRVNodeTable
+    table = CRVNodeTable.from_frame(pd.read_csv(CSV))
+    nodes = list(table)
+    assert isinstance(nodes[0], CRVNode) and not hasattr(nodes[0], "__dict__")
+    assert CRVNodeTable.from_nodes(nodes)[7].to_dict() == table[7].to_dict()
+
+    realms = [node.realm for node in nodes]
+    assert analysis.realm_distribution(table) == analysis.realm_distribution(nodes)
+    assert analysis.realm_distribution(nodes) == {r: realms.count(r) for r in set(realms)}
+    split = analysis.known_vs_new_constants(table)
+    assert split["known_constants"] == [n.crv_name for n in nodes if n.known_constant]
+    assert split["new_count"] == sum(not n.known_constant for n in nodes)
+    assert analysis.frequency_stats(table)["max_frequency"] == max(n.frequency for n in nodes)
+    assert np.isclose(analysis.crv_statistics(table)["mean_crv"], np.mean([n.crv_value for n in nodes]))
+
+    joined = CRVNodeTable.concat([table[:50], table[table.known_constant]])
+    assert len(joined) == 50 + table.known_constant.sum()
+    assert list(joined.labels("realm")) == list(table.labels("realm")[:50]) + \
+        list(table.labels("realm")[table.known_constant])
+
+def test_full_catalog_builder_is_deterministic(tmp_path):
+    import pandas as pd
+    from python.crv.mapping import build_full_catalog, realm_node_count, CATALOG_COLUMNS
+    options = dict(seed=3, samples=2, noise=0.01)
+    serial = build_full_catalog(chunk_size=5, **options)
+    assert len(serial) == 6 * realm_node_count(samples=2) == 6 * 2 * 190
+    assert list(serial["Node_ID"]) == list(range(1, len(serial) + 1))
+    assert set(serial.groupby(["Solid", "Node_Type", "Realm"]).size().index.get_level_values(2)) == \
+        {"quantum", "electromagnetic", "gravitational", "biological", "cosmological", "cross_realm"}
+    pd.testing.assert_frame_equal(build_full_catalog(workers=2, **options), serial)
+    single = build_full_catalog(realms=("biological",), **options)
+    subset = serial[serial["Realm"] == "biological"]
+    assert np.array_equal(single["Node_ID"], subset["Node_ID"])
+    assert np.array_equal(single["CRV_Value"], subset["CRV_Value"])
+
+    path = tmp_path / "generated.csv"
+    assert build_full_catalog(str(path), **options) == len(serial)
+    stored = CRVCatalog(str(path)).df
+    assert list(stored.columns) == CATALOG_COLUMNS and np.allclose(stored["Frequency_Hz"], serial["Frequency_Hz"])
+
+def test_streaming_exports(catalog, tmp_path):
+    import json
+    import pandas as pd
+    from python.crv.export import load_columnar
+    from python.crv.mapping import export_crv_catalog, iter_catalog_chunks
+    from python.crv.node import CRVNodeTable
+
+    assert catalog.export_jsonl(tmp_path / "catalog.jsonl", chunk_size=50) == len(catalog.df)
+    lines = (tmp_path / "catalog.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == catalog.df.to_dict(orient="records")
+
+    assert catalog.export_columnar(str(tmp_path / "columnar"), chunk_size=50) == len(catalog.df)
+    pd.testing.assert_frame_equal(load_columnar(str(tmp_path / "columnar")), catalog.df)
+
+    generated = iter_catalog_chunks(realms=("quantum",), chunk_size=40)
+    from python.crv.export import export_jsonl
+    assert export_jsonl(generated, tmp_path / "generated.jsonl") == 190
+
+    table = CRVNodeTable.from_frame(catalog.df)
+    export_crv_catalog(table, tmp_path / "nodes.json")
+    export_crv_catalog(table, tmp_path / "nodes.jsonl")
+    as_array = json.loads((tmp_path / "nodes.json").read_text(encoding="utf-8"))
+    assert as_array == [node.to_dict() for node in table]
+    assert [json.loads(line) for line in open(tmp_path / "nodes.jsonl", encoding="utf-8")] == as_array
+
+def test_incremental_save(catalog):
+    import os
+    path = catalog.csv_path
+    size = os.path.getsize(path)
+    catalog.set_value(3, "CRV_Value", 123.5)
+    new = dict(catalog.get_node(4), Node_ID=9001)
+    catalog.add_nodes([new])
+    catalog.set_value(9001, "Realm", "biological")
+    catalog.save(incremental=True)
+    assert os.path.getsize(path) > size and os.path.exists(catalog.patch_path)
+
+    reloaded = CRVCatalog(path)
+    assert reloaded.get_node(3)["CRV_Value"] == 123.5
+    assert reloaded.get_node(9001)["Realm"] == "biological"
+    assert len(reloaded.get_by_column("Realm", "biological")) == len(catalog.get_by_column("Realm", "biological"))
+
+    reloaded.save()
+    assert not os.path.exists(reloaded.patch_path)
+    assert CRVCatalog(path).get_node(3)["CRV_Value"] == 123.5
+
+def test_incremental_statistics(catalog):
+    from python.crv import analysis
+    from python.crv.node import CRVNodeTable
+
+    def expected():
+        table = CRVNodeTable.from_frame(catalog.df)
+        return {"nodes": len(table), "realm_distribution": analysis.realm_distribution(table),
+                **{k: v for k, v in analysis.known_vs_new_constants(table).items() if k.endswith("count")},
+                **analysis.frequency_stats(table), **analysis.crv_statistics(table)}
+
+    def check():
+        stats = catalog.statistics()
+        for key, value in expected().items():
+            assert stats[key] == value if not isinstance(value, float) else np.isclose(stats[key], value), key
+
+    check()
+    top = int(catalog.df.loc[catalog.df["Frequency_Hz"].idxmax(), "Node_ID"])
+    catalog.set_value(top, "Frequency_Hz", 1.0)
+    catalog.set_value(2, "Realm", "cosmological")
+    catalog.set_value(3, "Is_Known_Constant", False)
+    catalog.set_value(4, "CRV_Value", 1e6)
+    check()
+    catalog.add_nodes([dict(catalog.get_node(5), Node_ID=5000, CRV_Value=-3.0, Realm="new_realm")])
+    check()
+    smallest = int(catalog.df.loc[catalog.df["CRV_Value"].idxmin(), "Node_ID"])
+    assert catalog.remove_node(smallest) and catalog.get_node(smallest) is None
+    check()
+
+    refreshes = catalog._stats.crv.refreshes
+    for _ in range(100):
+        catalog.statistics()
+    assert catalog._stats.crv.refreshes == refreshes
+
+def test_nearest_constant_lookup(catalog):
+    from python.crv.lookup import ConstantIndex
+    known = catalog.df[catalog.df["Is_Known_Constant"]]
+    queries = np.random.default_rng(2).uniform(0, 30, 1000)
+    index = ConstantIndex(catalog.df)
+    _, matched, errors, rows = index.nearest(queries)
+    brute = known["CRV_Value"].to_numpy()[np.abs(queries[:, None] - known["CRV_Value"].to_numpy()).argmin(axis=1)]
+    assert np.array_equal(matched, brute) and np.allclose(errors, queries - brute)
+    assert np.array_equal(catalog.df["CRV_Value"].to_numpy()[rows[:, 0]], matched)
+
+    pi, e = np.pi, np.e
+    result = catalog.nearest_constant([pi * e, pi / e], pairs=True, relative=True)
+    assert [r["expression"] for r in result] == ["pi*e", "pi/e"]
+    assert [n["CRV_Name"] for n in result[0]["nodes"]] == ["pi", "e"]
+
+    catalog.set_value(1, "CRV_Value", 1000.0)
+    assert catalog.nearest_constant([999.0], known_only=False)[0]["nodes"][0]["Node_ID"] == 1
+
+def test_realm_partitioned_catalog(tmp_path):
+    import pandas as pd
+    from python.crv.partition import read_manifest, write_partitions
+    df = pd.read_csv(CSV)
+    directory = str(tmp_path / "catalog")
+    manifest = write_partitions(df, directory, chunk_size=50)
+    assert {realm: entry["rows"] for realm, entry in manifest["partitions"].items()} == \
+        df["Realm"].value_counts().to_dict()
+
+    catalog = CRVCatalog(directory, realms=["quantum", "gravitational"])
+    assert not hasattr(catalog, "nonexistent") and catalog._df is None
+    assert len(catalog.partition("quantum")) == (df["Realm"] == "quantum").sum()
+    assert list(catalog._partitions) == ["quantum"]
+    node_id = int(df.loc[df["Realm"] == "gravitational", "Node_ID"].iloc[0])
+    assert catalog.get_node(node_id)["Realm"] == "gravitational"
+    assert sorted(catalog.df["Realm"].unique()) == ["gravitational", "quantum"]
+    assert catalog.get_node(int(df.loc[df["Realm"] == "biological", "Node_ID"].iloc[0])) is None
+    with pytest.raises(ValueError):
+        CRVCatalog(directory, realms=["nonexistent"])
+
+    # Saving rewrites only the loaded realms; moving a node merges its new realm in
+    catalog.set_value(node_id, "Realm", "biological")
+    catalog.save()
+    assert read_manifest(directory)["partitions"]["biological"]["rows"] == (df["Realm"] == "biological").sum() + 1
+    reloaded = CRVCatalog(directory)
+    assert len(reloaded.df) == len(df)
+    assert reloaded.get_node(node_id)["Realm"] == "biological"
+    assert sorted(reloaded.df["Node_ID"]) == sorted(df["Node_ID"])
+
+def test_bulk_update_is_validated_and_atomic(catalog):
+    import pandas as pd
+    df = catalog.df.copy()
+    catalog.statistics()
+    node_ids = df["Node_ID"].to_numpy()[::3]
+    frequencies = np.linspace(1.0, 2.0, len(node_ids))
+    realms = np.where(np.arange(len(node_ids)) % 2, "quantum", "cosmological")
+    catalog.get_by_column("Realm", "quantum")
+    catalog.nearest_nodes([[0.5, 0.5, 0.5]])
+
+    for bad in ({"Frequency_Hz": -frequencies}, {"Frequency_Hz": realms}, {"Realm": frequencies},
+                {"Frequency_Hz": frequencies[:-1]}, {"Node_ID": node_ids}):
+        with pytest.raises(ValueError):
+            catalog.bulk_update(node_ids, {"Realm": realms, **bad})
+    with pytest.raises(ValueError):
+        catalog.bulk_update(np.append(node_ids, -1), {"Frequency_Hz": np.append(frequencies, 1.0)})
+    pd.testing.assert_frame_equal(catalog.df, df)
+
+    assert catalog.bulk_update(np.append(node_ids, node_ids[0]), {"Frequency_Hz": np.append(frequencies, 9.0),
+                                                                  "Realm": np.append(realms, "quantum")},
+                               save=True) == len(node_ids)
+    expected = df.copy()
+    expected.loc[::3, "Frequency_Hz"] = np.r_[9.0, frequencies[1:]]
+    expected.loc[::3, "Realm"] = np.r_[["quantum"], realms[1:]]
+    pd.testing.assert_frame_equal(catalog.df, expected)
+    assert catalog.statistics()["realm_distribution"] == expected["Realm"].value_counts().to_dict()
+    assert catalog.statistics()["max_frequency"] == expected["Frequency_Hz"].max()
+    assert len(catalog.get_by_column("Realm", "quantum")) == (expected["Realm"] == "quantum").sum()
+    in_band = expected[expected["Frequency_Hz"].between(1.0, 9.0)]
+    assert sorted(catalog.nodes_in_band(1.0, 9.0).to_frame()["Node_ID"]) == sorted(in_band["Node_ID"])
+    pd.testing.assert_frame_equal(CRVCatalog(catalog.csv_path).df, expected)
+
+def test_statistics_recover_from_empty_catalog(catalog):
+    records = catalog.df.iloc[:3].copy()
+    for node_id in catalog.df["Node_ID"].tolist():
+        catalog.remove_node(node_id)
+    assert catalog.statistics()["nodes"] == 0 and np.isnan(catalog.statistics()["min_frequency"])
+    catalog.add_nodes(records)
+    stats = catalog.statistics()
+    assert stats["min_frequency"] == records["Frequency_Hz"].min()
+    assert stats["max_crv"] == records["CRV_Value"].max()
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+from python.hgr.core import HGR
+
+def test_batch_variants_match_scalar():
+    rng = np.random.default_rng(0)
+    coords = rng.normal(size=(200, 3))
+    geometries = rng.choice(list(HGR.GEOMETRY_TYPES) + ['unknown'], 200)
+    realms = rng.choice(list(HGR.REALMS) + ['unknown'], 200)
+
+    crvs = HGR.crv_from_geometry_batch(geometries, coords)
+    assert np.allclose(crvs, [HGR.crv_from_geometry(g, c) for g, c in zip(geometries, coords)])
+    assert np.allclose(HGR.calculate_stability_batch(crvs), [HGR.calculate_stability(v) for v in crvs])
+    freqs = HGR.assign_frequency_batch(crvs, HGR.realm_codes(realms))
+    assert np.allclose(freqs, [HGR.assign_frequency(v, r) for v, r in zip(crvs, realms)])
+
+def test_ofbit_encode_batch_matches_scalar():
+    from python.hgr.core import OFBITWords
+    from python.nrci import calculate_nrci, calculate_nrci_packed
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(0, 1, 500), rng.uniform(-1e6, 1e6, 500),
+                             np.arange(-64, 64) / 4, [0.0, 2**23 / 28657, -1e-50, 1e40]])
+    expected = np.array([HGR.ofbit_encode(v) for v in values])
+    for precision in ('float64', 'float32'):
+        packed = HGR.ofbit_encode_batch(values, precision=precision)
+        assert packed.dtype == np.uint32
+        assert np.array_equal(HGR.ofbit_decode(packed), expected)
+
+    words = OFBITWords(packed)
+    assert np.array_equal(words[3], expected[3])
+    assert np.array_equal(words.position(23), expected[:, 23])
+    assert np.array_equal(words.popcount(), expected.sum(axis=1))
+    assert np.isclose(calculate_nrci_packed(packed[600], packed[601:700]),
+                      calculate_nrci(expected[600], list(expected[601:700])))
+
+def test_point_generators_vectorized_and_chunked():
+    from python.hgr import generators
+    cloud = generators.generate_noisy_tetrahedron(10_000, noise=0.05, rng=7, dtype=np.float32)
+    assert cloud.shape == (10_000, 3) and cloud.dtype == np.float32
+    chunks = list(generators.iter_noisy_solid(generators.TETRAHEDRON_VERTICES, 10_000, 0.05, rng=7,
+                                              chunk_size=3000, dtype=np.float32))
+    assert [len(c) for c in chunks] == [3000, 3000, 3000, 1000]
+    assert np.array_equal(np.concatenate(chunks), cloud)
+    nearest = np.linalg.norm(cloud[:, None] - generators.TETRAHEDRON_VERTICES, axis=2).min(axis=1)
+    assert nearest.max() < 0.5
+    assert generators.generate_noisy_tetrahedron(0).shape == (0, 3)
+    with pytest.raises(ValueError):
+        next(generators.iter_sphere_points(10, chunk_size=0))
+
+    torus = generators.generate_torus_points(2000)
+    theta = np.arctan2(torus[:, 1], torus[:, 0])
+    phi = np.arctan2(torus[:, 2], np.hypot(torus[:, 0], torus[:, 1]) - 1.0)
+    # A 2-D lattice: the tube angle is not locked to the ring angle
+    assert abs(np.corrcoef(theta, phi)[0, 1]) < 0.1
+    assert np.allclose(np.concatenate(list(generators.iter_torus_points(2000, chunk_size=512))), torus)
+
+    sphere = generators.generate_sphere_points(1000, dtype=np.float32)
+    assert np.allclose(np.linalg.norm(sphere, axis=1), 1, atol=1e-6)
+    assert np.allclose(np.concatenate(list(generators.iter_sphere_points(1000, chunk_size=300))), sphere)
+
+def test_solid_registry():
+    from python.hgr.solids import SOLIDS, get_solid
+    counts = {'tetrahedron': (4, 6, 4), 'cube': (8, 12, 6), 'octahedron': (6, 12, 8),
+              'dodecahedron': (20, 30, 12), 'icosahedron': (12, 30, 20),
+              '600-cell': (120, 720, 1200), '120-cell': (600, 1200, 720)}
+    for name in SOLIDS:
+        solid = get_solid(name)
+        assert (len(solid.vertices), len(solid.edges), len(solid.faces)) == counts[name]
+        assert np.allclose(np.linalg.norm(solid.vertices, axis=1), 1)
+        assert not solid.vertices.flags.writeable
+    assert get_solid('cube') is get_solid('cube')
+
+    cube = get_solid('cube')
+    index, distance = cube.nearest(cube.vertices * 1.1)
+    assert np.array_equal(index, np.arange(8)) and np.allclose(distance, 0.1)
+    index, distance = cube.nearest(cube.edge_midpoints, element='edge')
+    assert np.array_equal(index, np.arange(12)) and np.allclose(distance, 0)
+    index, _ = cube.nearest(cube.face_centers * 2, element='face')
+    assert np.array_equal(index, np.arange(6))
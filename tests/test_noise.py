@@ -0,0 +1,158 @@
+import pytest
+import numpy as np
+from python.nrci import compute_nrci
+from python.glr.base import glr_error
+from python.noise.core import NoiseSignal
+from python.noise.bitfield import PackedBitfield
+
+def _signal(length=5000, chunk_size=777):
+    rng = np.random.default_rng(42)
+    return NoiseSignal(rng.normal(0.1, 1.0, length), samplerate=100.0, chunk_size=chunk_size)
+
+def test_chunked_matches_in_memory():
+    signal = _signal()
+    whole = NoiseSignal(signal.data, samplerate=100.0, chunk_size=len(signal.data))
+    bits = (signal.data > np.mean(signal.data)).astype(int)
+    assert np.array_equal(signal.to_bitfield(), bits)
+    assert signal.toggle_rate() == np.sum(np.abs(np.diff(bits))) / 50.0
+    assert signal.glr() == glr_error(bits)
+    assert signal.glr() == whole.glr()
+    assert np.isclose(signal.nrci(winlen=64), compute_nrci(signal.data, winlen=64)[0])
+
+def test_from_file_memory_maps(tmp_path):
+    signal = _signal()
+    raw = tmp_path / "capture.bin"
+    signal.data.astype(np.float32).tofile(raw)
+    npy = tmp_path / "capture.npy"
+    np.save(npy, signal.data)
+
+    mapped = NoiseSignal.from_file(raw, dtype=np.float32, samplerate=100.0, chunk_size=777)
+    assert isinstance(mapped.data.base, np.memmap) or isinstance(mapped.data, np.memmap)
+    in_memory = NoiseSignal(signal.data.astype(np.float32), samplerate=100.0, chunk_size=777)
+    assert mapped.toggle_rate() == in_memory.toggle_rate()
+    assert mapped.glr() == in_memory.glr()
+
+    from_npy = NoiseSignal.from_file(npy, samplerate=100.0, chunk_size=777)
+    assert np.array_equal(from_npy.to_bitfield(), signal.to_bitfield())
+    assert from_npy.nrci(winlen=64) == signal.nrci(winlen=64)
+
+def test_packed_bitfield():
+    rng = np.random.default_rng(7)
+    for length in (0, 1, 7, 8, 9, 1001):
+        bits = rng.integers(0, 2, length)
+        packed = PackedBitfield.from_bits(bits)
+        assert packed.nbytes == (length + 7) // 8
+        assert np.array_equal(np.asarray(packed), bits)
+        assert packed.popcount() == bits.sum()
+        assert packed.toggle_count() == np.sum(np.abs(np.diff(bits)))
+
+    signal = _signal(length=1001)
+    packed = signal.to_bitfield()
+    assert isinstance(packed, PackedBitfield)
+    assert np.array_equal(np.asarray(packed), signal.to_bitfield(packed=False))
+
+def test_cached_quantities_invalidate():
+    signal = _signal()
+    assert signal.bitfield is signal.to_bitfield()
+    rate = signal.toggle_rate()
+
+    signal.threshold = 10.0  # Above every sample: no toggles
+    assert signal.toggle_rate() == 0
+    assert signal.glr() == 0.0
+
+    signal.threshold = None
+    assert signal.toggle_rate() == rate
+
+    signal.data = -signal.data
+    assert signal.mean() == np.sum(signal.data) / len(signal.data)
+    assert np.array_equal(np.asarray(signal.bitfield), signal.data > signal.mean())
+
+def test_batched_generators_chunk_invariant(tmp_path):
+    from python.noise.generators import NOISE_TYPES, generate_noise
+    for kind in NOISE_TYPES:
+        whole = generate_noise(kind, 3, 2000, rng=11)
+        chunked = generate_noise(kind, 3, 2000, rng=11, chunk_size=129)
+        assert whole.shape == (3, 2000)
+        assert np.array_equal(whole, chunked)
+
+    path = tmp_path / "pink.npy"
+    mapped = generate_noise("pink", 2, 1000, rng=3, path=path, dtype=np.float32, chunk_size=100)
+    assert np.array_equal(np.load(path), mapped)
+    channel = NoiseSignal.from_file(path, channel=1)
+    assert np.array_equal(channel.data, mapped[1])
+    with pytest.raises(ValueError):
+        NoiseSignal.from_file(path)
+
+def test_batch_analysis_report(tmp_path):
+    from python.noise.analysis import batch_analysis, analyze_signal
+    rng = np.random.default_rng(5)
+    signals = [rng.normal(size=3000) for _ in range(3)]
+    for i, data in enumerate(signals):
+        np.save(tmp_path / f"capture_{i}.npy", data)
+    signals[0].astype(np.float32).tofile(tmp_path / "capture_raw.bin")
+    (tmp_path / "notes.txt").write_text("not a capture")
+
+    report = batch_analysis(tmp_path, workers=2, dtype=np.float32, winlen=64, max_in_memory=10_000)
+    assert len(report) == 4
+    assert list(report["label"]) == sorted(str(p) for p in tmp_path.iterdir() if p.suffix != ".txt")
+
+    expected = analyze_signal(NoiseSignal(signals[1], label="x"), winlen=64)
+    row = report.iloc[1]
+    assert row["toggle_count"] == expected["toggle_count"]
+    assert row["glr_error"] == expected["glr_error"]
+    assert np.isclose(row["nrci"], expected["nrci"])
+
+def test_welch_psd_and_spectrogram(tmp_path):
+    rng = np.random.default_rng(9)
+    data = rng.normal(0, 2.0, 50000)
+    signal = NoiseSignal(data, samplerate=1000.0, chunk_size=4096)
+    freqs, psd = signal.psd(nperseg=256)
+    assert freqs.shape == psd.shape == (129,)
+    # White noise: the PSD integrates to the variance
+    assert np.isclose(np.trapezoid(psd, freqs), data.var(), rtol=0.05)
+
+    freqs, times, sxx = signal.spectrogram(nperseg=256)
+    assert sxx.shape == (129, len(times))
+    assert np.allclose(sxx.mean(axis=1), psd)
+
+    signal.samplerate = 500.0
+    assert np.isclose(signal.psd(nperseg=256)[0][-1], 250.0)
+
+    np.save(tmp_path / "capture.npy", data)
+    mapped = NoiseSignal.from_file(tmp_path / "capture.npy", samplerate=1000.0, chunk_size=1000)
+    assert np.allclose(mapped.psd(nperseg=256)[1], psd)
+
+def test_nrci_work_is_linear_in_length(monkeypatch):
+    from python.nrci import sampled_nrci
+    import python.noise.core as core
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=20000)
+    assert np.isclose(sampled_nrci(data, winlen=64, max_segments=1000), compute_nrci(data, winlen=64)[0])
+    assert abs(sampled_nrci(data, winlen=64, max_segments=200) - compute_nrci(data, winlen=64)[0]) < 1e-3
+
+    # Each NRCI makes one pass over the chunks and correlates at most max_segments windows,
+    # so the pairwise work is bounded and the rest grows linearly with the length
+    passes, windows = [], []
+    chunks, pairwise = NoiseSignal._chunks, core.blockwise_nrci
+    monkeypatch.setattr(NoiseSignal, "_chunks", lambda self: passes.append(1) or chunks(self))
+    monkeypatch.setattr(core, "blockwise_nrci", lambda segments, **kw: windows.append(len(segments))
+                        or pairwise(segments, **kw))
+    for length in (50_000, 200_000):
+        signal = NoiseSignal(rng.normal(size=length), chunk_size=1 << 14)
+        signal.mean()
+        signal.nrci(winlen=64, max_segments=256)
+    assert passes == [1, 1, 1, 1] and windows == [256, 256]
+
+def test_analysis_reads_streamed_capture_twice(monkeypatch):
+    from python.nrci import sampled_nrci
+    from python.noise.analysis import analyze_signal
+    data = np.random.default_rng(2).normal(size=30000)
+    signal = NoiseSignal(data, chunk_size=1000)
+    passes = []
+    chunks = NoiseSignal._chunks
+    monkeypatch.setattr(NoiseSignal, "_chunks", lambda self: passes.append(1) or chunks(self))
+    report = analyze_signal(signal, winlen=100, overlap=0.3)
+    assert len(passes) == 2
+    assert np.isclose(report["threshold"], np.mean(data))
+    assert np.isclose(report["nrci"], sampled_nrci(data, winlen=100, overlap=0.3))
+    assert np.isclose(signal.nrci(winlen=64, max_segments=100), sampled_nrci(data, winlen=64, max_segments=100))